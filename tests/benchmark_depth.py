@@ -0,0 +1,68 @@
+"""
+Cost of attribute lookups against inheritance depth, with wrapper container classes and in place ones.
+
+    python tests/benchmark_depth.py --depth 8 --reads 200000
+
+Every level of the hierarchy is a container subclass declaring one attribute, and the attribute
+of the base class is read through the deepest subclass. With container(cls) every level adds a wrapper
+class to the MRO. Subclasses of a container(cls, inplace=True) class are containers without decorating them.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wr_attrs import Attr, container  # noqa: E402
+
+
+def make_hierarchy(depth, inplace):
+    """
+    Returns the deepest class of a hierarchy of depth container classes.
+    """
+    @container(inplace=inplace)
+    class Base:
+        x = Attr(default=1)
+
+    cls = Base
+    for level in range(1, depth):
+        cls = type('Level{}'.format(level), (cls,), {'a{}'.format(level): Attr()})
+        if not inplace:
+            cls = container(cls)
+    return cls
+
+
+def measure_reads(depth, inplace, reads):
+    """
+    Returns seconds taken by reads reads of the base class attribute through an instance
+    of the deepest class, and through its attrs.
+    """
+    instance = make_hierarchy(depth, inplace)()
+    attrs = instance.attrs
+    return (
+        min(timeit.repeat(lambda: instance.x, number=reads, repeat=3)),
+        min(timeit.repeat(lambda: attrs.x.value, number=reads, repeat=3)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--depth', type=int, default=8, help='maximum depth of the hierarchy')
+    parser.add_argument('--reads', type=int, default=200000, help='number of reads measured')
+    args = parser.parse_args()
+
+    print('depth  mro wrapped  mro inplace  c.x wrapped  c.x inplace  attrs wrapped  attrs inplace')
+    for depth in range(1, args.depth + 1):
+        wrapped = measure_reads(depth, False, args.reads)
+        inplace = measure_reads(depth, True, args.reads)
+        print('{:5}  {:11}  {:11}  {:9.3f} s  {:9.3f} s  {:11.3f} s  {:11.3f} s'.format(
+            depth,
+            len(make_hierarchy(depth, False).__mro__), len(make_hierarchy(depth, True).__mro__),
+            wrapped[0], inplace[0], wrapped[1], inplace[1],
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Memory held by containers with and without Attr(intern=...), measured with tracemalloc.
+
+    python tests/benchmark_intern.py --instances 100000 --distinct 10
+
+Every instance gets a value built at run time (so not interned by Python itself)
+out of a small number of distinct values, like statuses or country codes read from a file.
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wr_attrs import Attr, container  # noqa: E402
+
+
+def measure_memory(intern, instances, distinct):
+    """
+    Returns bytes allocated for instances containers holding one of distinct string values.
+    """
+    @container
+    class Record:
+        status = Attr(intern=intern)
+        region = Attr(intern=intern)
+
+    tracemalloc.start()
+    try:
+        records = [
+            Record(status=''.join(['status-', str(i % distinct)]), region=''.join(['region-', str(i % distinct)]))
+            for i in range(instances)
+        ]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del records
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--instances', type=int, default=100000, help='number of instances')
+    parser.add_argument('--distinct', type=int, default=10, help='number of distinct values')
+    args = parser.parse_args()
+
+    plain = measure_memory(False, args.instances, args.distinct)
+    interned = measure_memory(True, args.instances, args.distinct)
+    print('intern=False: {:8.1f} MB'.format(plain / 1e6))
+    print('intern=True:  {:8.1f} MB  ({:.0%})'.format(interned / 1e6, interned / plain))
+
+
+if __name__ == '__main__':
+    main()
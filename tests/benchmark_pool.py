@@ -0,0 +1,64 @@
+"""
+Cost of taking containers from the pool (attrs._acquire_/_release_) compared to creating new ones.
+
+    python tests/benchmark_pool.py --instances 100000 --repeat 5
+
+Every round creates (or acquires) short-lived instances with a few values set and drops
+(or releases) them, like messages decoded and discarded one at a time.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wr_attrs import Attr, container  # noqa: E402
+
+
+@container
+class Message:
+    id = Attr()
+    topic = Attr()
+    payload = Attr()
+    tags = Attr(default_factory=list)
+
+
+def construct(instances):
+    for i in range(instances):
+        message = Message(id=i, topic='topic', payload=b'payload')
+        _ = message.tags  # noqa
+
+
+def acquire(instances):
+    acquire_, release_ = Message.attrs._acquire_, Message.attrs._release_
+    for i in range(instances):
+        message = acquire_(id=i, topic='topic', payload=b'payload')
+        _ = message.tags  # noqa
+        release_(message)
+
+
+def measure_times(instances, repeat=5):
+    """
+    Returns best times in seconds of creating instances new containers and of acquiring them from the pool.
+    """
+    return (
+        min(timeit.repeat(lambda: construct(instances), number=1, repeat=repeat)),
+        min(timeit.repeat(lambda: acquire(instances), number=1, repeat=repeat)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--instances', type=int, default=100000, help='number of instances per round')
+    parser.add_argument('--repeat', type=int, default=5, help='number of rounds, the best one is reported')
+    args = parser.parse_args()
+
+    constructed, acquired = measure_times(args.instances, args.repeat)
+    print('new instances:   {:.3f} s'.format(constructed))
+    print('_acquire_ pool:  {:.3f} s  ({:.0%})'.format(acquired, acquired / constructed))
+
+
+if __name__ == '__main__':
+    main()
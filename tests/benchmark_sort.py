@@ -0,0 +1,59 @@
+"""
+Time to sort containers by several attributes with a lambda key and with attrs._key_().
+
+    python tests/benchmark_sort.py --instances 1000000
+
+Instances are sorted by two attributes, one of which has few distinct values,
+like records sorted by status and then by date.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wr_attrs import Attr, container  # noqa: E402
+
+
+@container
+class Record:
+    status = Attr()
+    created = Attr()
+
+
+def make_records(instances, seed=0):
+    rnd = random.Random(seed)
+    return [Record(status=rnd.randrange(10), created=rnd.random()) for _ in range(instances)]
+
+
+def measure_sort(records):
+    """
+    Returns seconds taken to sort records by (status, created) with a lambda key and with a compiled key.
+    """
+    started = time.perf_counter()
+    by_lambda = sorted(records, key=lambda r: (r.status, r.created))
+    lambda_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    by_key = sorted(records, key=Record.attrs._key_('status', 'created'))
+    key_time = time.perf_counter() - started
+
+    assert by_lambda == by_key
+    return lambda_time, key_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--instances', type=int, default=1000000, help='number of instances sorted')
+    args = parser.parse_args()
+
+    lambda_time, key_time = measure_sort(make_records(args.instances))
+    print('key=lambda:  {:.3f} s'.format(lambda_time))
+    print('key=_key_(): {:.3f} s  ({:.0%})'.format(key_time, key_time / lambda_time))
+
+
+if __name__ == '__main__':
+    main()
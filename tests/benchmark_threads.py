@@ -0,0 +1,85 @@
+"""
+Read/write throughput of containers shared by 1 to N threads.
+
+    python tests/benchmark_threads.py --threads 8 --seconds 2
+
+Every thread reads and writes attributes of the same few container instances.
+On a free-threaded build of CPython (``python3.13t`` with ``PYTHON_GIL=0``)
+throughput should grow with the number of threads; with the GIL it stays flat.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wr_attrs import Attr, container  # noqa: E402
+
+
+@container
+class Shared:
+    x = Attr(default=1)
+    y = Attr()
+    items = Attr(default_factory=list)
+
+    @Attr.init_value
+    def z(self, attr, value):
+        attr.value = 0
+
+
+def worker(instances, barrier, deadline, counts, slot):
+    operations = 0
+    barrier.wait()
+    while time.perf_counter() < deadline[0]:
+        for c in instances:
+            c.y = c.x + c.z
+            c.attrs.set('y', c.y)
+            _ = c.items  # noqa
+        operations += 4 * len(instances)
+    counts[slot] = operations
+
+
+def measure_throughput(threads, seconds, instances=4):
+    """
+    Returns operations (attribute reads and writes) per second of threads
+    working on the same instances for the given number of seconds.
+    """
+    shared = [Shared() for _ in range(instances)]
+    barrier = threading.Barrier(threads + 1)
+    deadline = [0.0]
+    counts = [0] * threads
+    pool = [
+        threading.Thread(target=worker, args=(shared, barrier, deadline, counts, i))
+        for i in range(threads)
+    ]
+    for t in pool:
+        t.start()
+    deadline[0] = time.perf_counter() + seconds
+    started = time.perf_counter()
+    barrier.wait()
+    for t in pool:
+        t.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 1, help='maximum number of threads')
+    parser.add_argument('--seconds', type=float, default=1.0, help='duration of each measurement')
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('Python {} ({})'.format(sys.version.split()[0], 'GIL' if gil_enabled else 'free-threaded'))
+
+    baseline = None
+    for threads in range(1, args.threads + 1):
+        throughput = measure_throughput(threads, args.seconds)
+        baseline = baseline or throughput
+        print('{:3d} threads: {:12,.0f} ops/s  x{:.2f}'.format(threads, throughput, throughput / baseline))
+
+
+if __name__ == '__main__':
+    main()
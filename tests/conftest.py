@@ -2,6 +2,8 @@ import pytest
 
 from wr_attrs import Attr, container
 
+pytest_plugins = ['wr_attrs.pytest_plugin']
+
 
 @pytest.fixture
 def xy_container_cls():
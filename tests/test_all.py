@@ -1,3 +1,4 @@
+import sys
 from copy import copy
 
 import pytest
@@ -85,6 +86,72 @@ def test_setting_attr_in_inherited_class_sets_default():
     assert c.x is None
 
 
+def test_setting_attr_in_inherited_class_replaces_default_factory():
+    @container
+    class C:
+        x = Attr(default_factory=list)
+
+    class D(C):
+        x = 100
+
+    assert D().x == 100
+    assert D.attrs.x.default_factory is None
+    assert C().x == []
+
+
+def test_overridden_default_keeps_options_isolated():
+    @container
+    class C:
+        x = Attr(safe=True)
+
+    class D(C):
+        x = 100
+
+    D.attrs.x.safe = False
+    assert C.attrs.x.safe is True
+    assert D.attrs.x.safe is False
+
+    C.attrs.x.safe = None
+    assert D.attrs.x.safe is False
+
+
+def test_overridden_default_delegates_other_fields_to_parent():
+    @container
+    class C:
+        x = Attr(safe=True, cli=True)
+
+    class D(C):
+        x = 100
+
+    C.attrs.x.cli = False
+    C.attrs.x.default = 5
+
+    assert D.attrs.x.cli is False
+    assert D.attrs.x.default == 100
+    assert D.attrs.x.options == {'safe': True, 'cli': False}
+
+
+def test_overridden_default_inherits_from_nearest_class():
+    @container
+    class C:
+        x = Attr()
+
+    class D(C):
+        x = copy(C.x)
+
+        @x.set_value
+        def x(self, attr, value):
+            attr.value = value * 5
+
+    class E(D):
+        x = 1
+
+    e = E()
+    assert e.x == 1
+    e.x = 2
+    assert e.x == 10
+
+
 def test_customising_inherited_attribute():
     @container
     class C:
@@ -418,3 +485,141 @@ def test_cannot_delete_attr_of_container_class_or_instance():
 
     with pytest.raises(NotImplementedError):
         del c.x
+
+
+def test_container_in_place():
+    class C:
+        x = Attr()
+        y = Attr(default=2)
+
+    assert container(inplace=True)(C) is C
+    assert C.__mro__ == (C, object)
+
+    c = C(x=1)
+    assert (c.x, c.y) == (1, 2)
+    assert C.attrs._names_ == ['x', 'y']
+    assert repr(c.attrs.x) == '<BoundAttr C.x>'
+
+    c.y = 3
+    assert c.attrs.y.value == 3
+
+
+def test_container_in_place_subclasses():
+    @container(inplace=True)
+    class C:
+        x = Attr()
+
+    class D(C):
+        x = 100
+        z = Attr()
+
+    assert D.__mro__ == (D, C, object)
+    assert set(D.attrs._names_) == {'x', 'z'}
+    assert C.attrs._names_ == ['x']
+
+    d = D(z=1)
+    assert (d.x, d.z) == (100, 1)
+    assert C().x is None
+
+
+def test_container_in_place_with_init():
+    @container(inplace=True)
+    class C:
+        x = Attr()
+
+        def __init__(self, extra=None):
+            self.extra = extra
+            self.x_when_init = self.x
+
+    c = C(x=1, extra=2)
+    assert (c.x, c.extra, c.x_when_init) == (1, 2, 1)
+
+    class D(C):
+        y = Attr()
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.y_when_init = self.y
+
+    d = D(x=3, y=4, extra=5)
+    assert (d.x, d.y, d.extra, d.y_when_init) == (3, 4, 5, 4)
+
+
+def test_cannot_make_container_in_place_twice():
+    @container
+    class C:
+        x = Attr()
+
+    with pytest.raises(TypeError):
+        container(inplace=True)(C)
+
+
+def test_depth_benchmark_runs():
+    from .benchmark_depth import make_hierarchy, measure_reads
+
+    assert len(make_hierarchy(3, True).__mro__) < len(make_hierarchy(3, False).__mro__)
+    assert all(t > 0 for t in measure_reads(3, True, reads=100))
+
+
+@container
+class _Budgeted:
+    a = Attr()
+    b = Attr()
+    c = Attr()
+    d = Attr()
+
+    @Attr
+    def hooked(self, attr):
+        return attr.value
+
+    @hooked.set_value
+    def hooked(self, attr, value):
+        attr.value = value
+
+
+# Budgets are about 1.5 times the figures measured on CPython 3.11: counts of calls and
+# allocated blocks differ between interpreter versions, the budgets are there to catch regressions.
+def test_plain_read_budget(budget):
+    obj = _Budgeted(a=1)
+    budget(lambda: obj.a, calls=8, blocks=0)
+
+
+def test_hooked_write_budget(budget):
+    obj = _Budgeted()
+    budget(lambda: setattr(obj, 'hooked', 1), calls=14, blocks=0)
+
+
+@pytest.mark.parametrize('n, calls, blocks', [
+    (0, 2, 4),
+    (2, 45, 24),
+    (4, 84, 36),
+])
+def test_construction_budget(budget, n, calls, blocks):
+    kwargs = dict(zip('abcd', range(n)))
+    budget(lambda: _Budgeted(**kwargs), calls=calls, blocks=blocks)
+
+
+def test_process_budget(budget):
+    obj = _Budgeted()
+    budget(lambda: obj.attrs._process_({'a': 1, 'b': 2}), calls=21, blocks=0)
+
+
+def test_budget_reports_exceeded_budget(budget):
+    obj = _Budgeted(a=1)
+    with pytest.raises(AssertionError):
+        budget(lambda: obj.a, calls=0)
+    with pytest.raises(AssertionError):
+        budget(lambda: [obj] * 100, blocks=0)
+
+
+def test_budget_restores_active_profiler(budget):
+    def profiler(frame, event, arg):
+        pass
+
+    obj = _Budgeted(a=1)
+    sys.setprofile(profiler)
+    try:
+        budget(lambda: obj.a)
+        assert sys.getprofile() is profiler
+    finally:
+        sys.setprofile(None)
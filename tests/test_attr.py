@@ -1,6 +1,8 @@
+from decimal import Decimal
+
 import pytest
 
-from wr_attrs import Attr, container
+from wr_attrs import Attr, InternTable, container
 
 
 def test_repr():
@@ -43,3 +45,114 @@ def test_init_value_called_once():
 
     c5 = C()
     assert c5.x is None
+
+
+def test_reading_default_does_not_store_value():
+    @container
+    class C:
+        x = Attr(default=5)
+
+    c = C()
+    assert c.x == 5
+    assert not c.attrs.x.has_value_initialised
+
+    C.attrs.x.default = 6
+    assert c.x == 6
+
+    c.x = 7
+    assert c.attrs.x.has_value_initialised
+    assert c.x == 7
+
+
+def test_default_factory():
+    @container
+    class C:
+        x = Attr(default_factory=list)
+
+    c1 = C()
+    c2 = C()
+    c1.x.append(1)
+
+    assert c1.x == [1]
+    assert c2.x == []
+    assert C.attrs.x.default is None
+
+
+def test_default_factory_is_passed_to_init_value():
+    @container
+    class C:
+        x = Attr(default_factory=lambda: [1])
+
+        @x.init_value
+        def x(self, attr, value):
+            attr.value = value + [2]
+
+    assert C().x == [1, 2]
+    assert C(x=[3]).x == [3, 2]
+
+
+def test_cannot_set_default_factory_with_default_or_required():
+    with pytest.raises(ValueError):
+        Attr(default=1, default_factory=list)
+
+    with pytest.raises(ValueError):
+        Attr(required=True, default_factory=list)
+
+
+def test_intern():
+    @container
+    class C:
+        status = Attr(intern=True)
+        other = Attr()
+
+    a = C(status=''.join(['ac', 'tive']))
+    b = C()
+    b.status = ''.join(['act', 'ive'])
+    b.other = ''.join(['act', 'ive'])
+
+    assert a.status is b.status
+    assert b.other is not a.status
+    assert C.attrs.status.intern.stats() == {'size': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_intern_table_shared_between_attrs():
+    table = InternTable()
+
+    @container
+    class C:
+        region = Attr(intern=table)
+        currency = Attr(intern=table)
+
+    c = C(region=''.join(['e', 'u']), currency=''.join(['e', 'u']))
+    assert c.region is c.currency
+    assert len(table) == 1
+
+
+def test_intern_table():
+    table = InternTable(maxsize=2)
+    assert table(1) == 1
+    assert table(True) is True
+    assert table(b'x') == b'x'
+    assert table([1]) == [1]
+    assert len(table) == 2
+    assert table.misses == 3
+
+    table.clear()
+    assert table.stats() == {'size': 0, 'hits': 0, 'misses': 0, 'hit_rate': 0.0}
+
+
+def test_intern_keeps_equal_values_that_are_not_interchangeable():
+    @container
+    class C:
+        x = Attr(intern=True)
+
+    for a, b in [(0.0, -0.0), (Decimal('1.0'), Decimal('1.00')), ((1,), (1.0,)), (1, True)]:
+        C(x=a)
+        c = C(x=b)
+        assert repr(c.x) == repr(b)
+
+
+def test_intern_benchmark_runs():
+    from .benchmark_intern import measure_memory
+
+    assert measure_memory(True, instances=100, distinct=2) < measure_memory(False, instances=100, distinct=2)
@@ -1,6 +1,9 @@
+import io
+from copy import copy
+
 import pytest
 
-from wr_attrs import Attr, Attrs, container
+from wr_attrs import Attr, Attrs, Required, container
 
 
 def test_attrs_cls_names_is_a_property():
@@ -102,3 +105,188 @@ def test_process(xy_container_cls, payload, kwargs, x_and_y, payload_after):
         c.attrs._process_(payload, **kwargs)
         assert (c.x, c.y) == x_and_y
         assert payload == payload_after
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+@pytest.mark.parametrize('as_bytes', [False, True])
+def test_iter_jsonl(xy_container_cls, chunk_size, as_bytes):
+    content = '{"x": 1, "y": "\u00e4"}\n\n{"x": 2}\n{"y": [3, 4]}'
+    fileobj = io.BytesIO(content.encode('utf-8')) if as_bytes else io.StringIO(content)
+
+    instances = xy_container_cls.attrs._iter_jsonl_(fileobj, chunk_size=chunk_size)
+    assert not isinstance(instances, list)
+    assert [(c.x, c.y) for c in instances] == [(1, '\u00e4'), (2, None), (None, [3, 4])]
+
+
+def test_iter_lines_decodes_binary_lines():
+    from wr_attrs.attrs3 import iter_lines
+
+    content = 'a\n\u00e4\u00f6\n\nb'
+    assert list(iter_lines(io.BytesIO(content.encode('utf-8')), chunk_size=1)) == ['a', '\u00e4\u00f6', 'b']
+    assert list(iter_lines(io.StringIO(content), chunk_size=1)) == ['a', '\u00e4\u00f6', 'b']
+
+
+def test_iter_jsonl_unknown_keys(xy_container_cls):
+    content = '{"x": 1, "z": 3}\n{"y": 2}\n'
+
+    with pytest.raises(AttributeError):
+        list(xy_container_cls.attrs._iter_jsonl_(io.StringIO(content)))
+
+    instances = xy_container_cls.attrs._iter_jsonl_(io.StringIO(content), ignore_unknown=True)
+    assert [(c.x, c.y) for c in instances] == [(1, None), (None, 2)]
+
+    pairs = xy_container_cls.attrs._iter_jsonl_(io.StringIO(content), collect_unknown=True)
+    assert [((c.x, c.y), unknown) for c, unknown in pairs] == [((1, None), {'z': 3}), ((None, 2), {})]
+
+
+def test_iter_jsonl_calls_init_value():
+    @container
+    class C:
+        x = Attr()
+
+        @Attr.init_value
+        def y(self, attr, value):
+            attr.value = value * 2
+
+    c, = C.attrs._iter_jsonl_(io.StringIO('{"x": 1, "y": 2}'))
+    assert (c.x, c.y) == (1, 4)
+
+
+def test_iter_jsonl_interns_values():
+    @container
+    class C:
+        x = Attr(intern=True)
+
+    a, b = C.attrs._iter_jsonl_(io.StringIO('{"x": "value"}\n{"x": "value"}'))
+    assert a.x is b.x
+
+
+def test_reset():
+    @container
+    class C:
+        x = Attr(default=1)
+        y = Attr(default_factory=list)
+
+        @Attr.init_value
+        def z(self, attr, value):
+            attr.value = 'initialised'
+
+    c = C(x=2, z='set')
+    c.y.append(1)
+    c.extra = 'extra'
+    attrs = c.attrs
+    bound_x = c.attrs.x
+
+    c.attrs._reset_(y=[2])
+    assert (c.x, c.y, c.z) == (1, [2], 'initialised')
+    assert c.attrs is attrs
+    assert c.attrs.x is bound_x
+    assert c.extra == 'extra'
+
+    with pytest.raises(AttributeError):
+        c.attrs._reset_(unknown=1)
+
+
+def test_acquire_and_release(xy_container_cls):
+    C = xy_container_cls
+
+    c = C.attrs._acquire_(x=1)
+    assert (c.x, c.y) == (1, None)
+
+    C.attrs._release_(c)
+    assert (c.x, c.y) == (None, None)
+    with pytest.raises(ValueError):
+        C.attrs._release_(c)
+
+    d = C.attrs._acquire_(y=2)
+    assert d is c
+    assert (d.x, d.y) == (None, 2)
+
+    assert C.attrs._acquire_() is not d
+
+
+def test_acquire_takes_attribute_values_only(xy_container_cls):
+    class D(xy_container_cls):
+        def __init__(self, tag=None, **kwargs):
+            super().__init__(**kwargs)
+            self.tag = tag
+
+    with pytest.raises(AttributeError):
+        D.attrs._acquire_(x=1, tag='a')
+    d = D.attrs._acquire_(x=1)
+    assert (d.x, d.tag) == (1, None)
+
+    D.attrs._release_(d)
+    with pytest.raises(AttributeError):
+        D.attrs._acquire_(x=1, tag='a')
+
+
+def test_pool_benchmark_runs():
+    from .benchmark_pool import measure_times
+
+    assert all(t > 0 for t in measure_times(instances=100, repeat=1))
+
+
+def test_pool_size_is_bounded(xy_container_cls):
+    class D(xy_container_cls):
+        attrs_pool_size = 1
+
+    a, b = D(), D()
+    D.attrs._release_(a)
+    D.attrs._release_(b)
+    assert D.attrs._acquire_() is a
+    assert D.attrs._acquire_() is not b
+
+    with pytest.raises(TypeError):
+        D.attrs._release_(xy_container_cls())
+
+
+def test_missing():
+    @container
+    class C:
+        a = Attr(required=True)
+        b = Attr()
+        c = Attr(required=True)
+
+    c = C(c=3)
+    assert c.attrs._missing_() == ['a']
+    assert c.attrs._missing_() == ['a']
+
+    c.a = 1
+    assert c.attrs._missing_() == []
+    c.attrs.set('c', Required)
+    assert c.attrs._missing_() == ['c']
+    with pytest.raises(ValueError):
+        _ = c.c  # noqa
+
+    c.attrs._reset_(a=1)
+    assert c.attrs._missing_() == ['c']
+    c.c = 3
+    assert copy(c).attrs._missing_() == []
+    # No state besides attribute values
+    assert c.__reduce__()[2][2] is None
+
+    d = next(C.attrs._iter_jsonl_(io.StringIO('{"a": 1}\n')))
+    assert d.attrs._missing_() == ['c']
+
+
+def test_missing_after_required_changes():
+    @container
+    class C:
+        a = Attr(required=True)
+        b = Attr()
+        c = Attr(required=True)
+
+    c = C()
+    assert c.attrs._missing_() == ['a', 'c']
+
+    C.attrs.b.required = True
+    c.b = 2
+    c.c = 3
+    assert c.attrs._missing_() == ['a']
+    c.attrs.set('b', Required)
+    assert c.attrs._missing_() == ['a', 'b']
+
+    C.attrs.a.required = False
+    c.c = Required
+    assert c.attrs._missing_() == ['b', 'c']
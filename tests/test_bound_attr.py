@@ -1,5 +1,11 @@
+import threading
+import time
+from copy import copy
+
 import pytest
 
+from wr_attrs import Attr, container
+
 
 def test_repr(xy_container_cls):
     c = xy_container_cls()
@@ -9,3 +15,92 @@ def test_repr(xy_container_cls):
 def test_class_bound_attr_has_no_value(xy_container_cls):
     with pytest.raises(TypeError):
         _ = xy_container_cls.attrs.x.value  # noqa
+
+
+def test_delegated_reads_follow_attr_changes():
+    @container
+    class C:
+        x = Attr(safe=True)
+
+    c = C()
+    assert (c.attrs.x.safe, c.attrs.x.default, c.attrs.x.required) == (True, None, False)
+
+    C.attrs.x.safe = False
+    C.attrs.x.default = 5
+    assert (c.attrs.x.safe, c.attrs.x.default) == (False, 5)
+    assert c.attrs.x.options == {'safe': False}
+
+    with pytest.raises(AttributeError):
+        _ = c.attrs.x.unsafe  # noqa
+
+
+def test_attr_record_is_read_only():
+    x = Attr(safe=True)
+    with pytest.raises(AttributeError):
+        x._record_.safe = False
+    assert x.safe is True
+
+
+def test_copied_attr_has_own_options():
+    x = Attr('x', safe=True)
+    y = copy(x)
+    y.safe = False
+    y.default = 1
+
+    assert (x.safe, x.default) == (True, None)
+    assert (y.safe, y.default) == (False, 1)
+
+
+def test_concurrent_first_access():
+    calls = []
+    barrier = threading.Barrier(8)
+
+    @container
+    class C:
+        @Attr.init_value
+        def x(self, attr, value):
+            calls.append(threading.get_ident())
+            time.sleep(0.01)
+            attr.value = 'initialised'
+
+    c = C()
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append((c.attrs, c.attrs.x, c.x))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len({id(a) for a, _, _ in results}) == 1
+    assert len({id(b) for _, b, _ in results}) == 1
+    assert [v for _, _, v in results] == ['initialised'] * 8
+
+
+def test_failed_init_value_can_be_retried():
+    @container
+    class C:
+        @Attr.init_value
+        def x(self, attr, value):
+            if value is None:
+                raise ValueError()
+            attr.value = value
+
+    c = C()
+    with pytest.raises(ValueError):
+        _ = c.x  # noqa
+    assert not c.attrs.x.has_value_initialised
+
+    c.x = 1
+    assert c.x == 1
+
+
+def test_thread_benchmark_runs():
+    from .benchmark_threads import measure_throughput
+
+    assert measure_throughput(threads=2, seconds=0.05) > 0
@@ -0,0 +1,156 @@
+import io
+import pickle
+from copy import copy, deepcopy
+
+import pytest
+
+from wr_attrs import Attr, container
+from wr_attrs.codec import get_codec
+
+
+@container
+class Point:
+    x = Attr(fmt='d')
+    y = Attr(fmt='d')
+    label = Attr()
+    code = Attr(fmt='4s')
+    owner = Attr(required=True)
+
+
+def test_codec_is_created_once_per_class():
+    assert get_codec(Point) is get_codec(Point)
+
+    class Point3D(Point):
+        z = Attr(fmt='d')
+
+    assert get_codec(Point3D) is not get_codec(Point)
+    assert 'z' in get_codec(Point3D).names
+    assert get_codec(Point3D).fingerprint != get_codec(Point).fingerprint
+
+
+def test_dumps_and_loads():
+    codec = get_codec(Point)
+    p = Point(x=1.5, y=-2.0, label={'a': [1, 2]}, code=b'ab12', owner='me')
+
+    data = codec.dumps(p)
+    assert b'Point#' not in data
+
+    q = codec.loads(data)
+    assert isinstance(q, Point)
+    assert (q.x, q.y, q.label, q.code, q.owner) == (1.5, -2.0, {'a': [1, 2]}, b'ab12', 'me')
+
+
+def test_unset_attributes_stay_unset():
+    codec = get_codec(Point)
+    p = Point(label='only label')
+
+    q = codec.loads(codec.dumps(p))
+    assert q.label == 'only label'
+    assert not q.attrs.x.has_value_initialised
+    assert q.x is None
+    with pytest.raises(ValueError):
+        _ = q.owner  # noqa
+
+
+def test_loads_rejects_other_schema():
+    @container
+    class Other:
+        x = Attr(fmt='d')
+
+    with pytest.raises(ValueError):
+        get_codec(Point).loads(get_codec(Other).dumps(Other(x=1.0)))
+
+
+def test_values_that_do_not_fit_fixed_format_are_pickled():
+    codec = get_codec(Point)
+    p = Point(x='not a number', y=None, code=b'ab', owner='me')
+    p.attrs.label.value = 10 ** 30
+
+    data = codec.dumps(p)
+    q = codec.loads(data)
+    assert (q.x, q.y, q.code, q.label) == ('not a number', None, b'ab', 10 ** 30)
+    assert q.attrs.y.has_value_initialised
+    assert codec.fixed_values(data) == {'x': 'not a number', 'y': None, 'code': b'ab'}
+
+    r = codec.loads(codec.dumps(Point(x=1, owner='me')))
+    assert type(r.x) is int
+
+
+def test_fmt_options_that_are_not_single_struct_values_are_ignored():
+    @container
+    class Event:
+        day = Attr(fmt='%Y-%m-%d')
+        pair = Attr(fmt='2d')
+        count = Attr(fmt='q')
+
+    codec = get_codec(Event)
+    assert [codec.names[i] for i in codec.fixed_indexes] == ['count']
+
+    e = Event(day='2020-01-02', pair=(1.0, 2.0), count=None)
+    f = codec.loads(codec.dumps(e))
+    assert (f.day, f.pair, f.count) == ('2020-01-02', (1.0, 2.0), None)
+
+    g = deepcopy(e)
+    assert (g.day, g.pair, g.count) == ('2020-01-02', (1.0, 2.0), None)
+
+
+def test_fixed_values_are_decoded_from_buffer():
+    codec = get_codec(Point)
+    data = b'xx' + codec.dumps(Point(x=3.0, code=b'abcd', owner='me'))
+
+    assert codec.fixed_values(bytearray(data), offset=2) == {'x': 3.0, 'y': None, 'code': b'abcd'}
+
+
+def test_dump_and_load_stream():
+    codec = get_codec(Point)
+    buf = io.BytesIO()
+    codec.dump((Point(x=float(i), owner=i) for i in range(5)), buf)
+
+    buf.seek(0)
+    points = codec.load(buf)
+    assert [(p.x, p.owner) for p in points] == [(float(i), i) for i in range(5)]
+
+
+def test_pickle():
+    p = Point(x=1.0, y=2.0, label='a', owner='me')
+    p.note = 'not an attr'
+
+    q = pickle.loads(pickle.dumps(p))
+    assert (q.x, q.y, q.label, q.owner) == (1.0, 2.0, 'a', 'me')
+    assert q.note == 'not an attr'
+    assert q.attrs.owner is q
+
+    assert len(pickle.dumps(p)) < len(pickle.dumps(p.__dict__))
+
+
+def test_copy_and_deepcopy():
+    p = Point(label=['a'], owner='me')
+    assert p.attrs.owner is p
+
+    q = copy(p)
+    assert q.attrs.owner is q
+    assert q.label is p.label
+
+    r = deepcopy(p)
+    assert r.attrs.owner is r
+    assert r.label == p.label
+    assert r.label is not p.label
+
+
+@container
+class Node:
+    value = Attr()
+    next = Attr()
+
+
+def test_pickle_and_deepcopy_preserve_references():
+    a = Node(value=[1])
+    a.next = a
+    b = Node(value=a.value, next=[Node(next=a)])
+
+    for x, y in [pickle.loads(pickle.dumps((a, b))), deepcopy((a, b))]:
+        assert x.next is x
+        assert y.next[0].next is x
+        assert y.value is x.value
+        assert x.value == [1]
+        assert x.value is not a.value
@@ -0,0 +1,131 @@
+import pytest
+
+from wr_attrs import Attr, container
+
+
+@container
+class C:
+    a = Attr()
+    b = Attr(default=0)
+    c = Attr(required=True)
+
+    @Attr
+    def d(self, attr):
+        return (attr.value or 0) * 10
+
+
+def test_key_reads_values():
+    c = C(a=1, c=3, d=4)
+
+    assert C.attrs._key_('a')(c) == 1
+    assert C.attrs._key_('a', 'b', 'c', 'd')(c) == (1, 0, 3, 40)
+    assert c.attrs._key_('b', 'a')(c) == (0, 1)
+
+
+def test_key_is_compiled_once():
+    assert C.attrs._key_('a', 'b') is C.attrs._key_('a', 'b')
+    assert C.attrs._key_('a', 'b') is not C.attrs._key_('b', 'a')
+
+
+def test_key_follows_class_level_default():
+    @container
+    class E:
+        x = Attr(default=1)
+
+    key = E.attrs._key_('x')
+    E.attrs.x.default = 2
+    assert key(E()) == 2
+
+
+def test_key_checks_required():
+    with pytest.raises(ValueError):
+        C.attrs._key_('c')(C())
+
+
+def test_key_of_subclass_instance():
+    class D(C):
+        b = 5
+
+    assert C.attrs._key_('a', 'b')(D(a=1)) == (1, 5)
+    assert D.attrs._key_('a', 'b')(D(a=1)) == (1, 5)
+
+
+def test_key_of_unknown_name():
+    with pytest.raises(AttributeError):
+        C.attrs._key_('x')
+
+
+def test_sort_group_and_filter():
+    items = [C(a=a, b=b, c=None) for a, b in [(2, 1), (1, 2), (2, 0), (1, 1)]]
+
+    assert [(i.a, i.b) for i in sorted(items, key=C.attrs._key_('a', 'b'))] == [(1, 1), (1, 2), (2, 0), (2, 1)]
+
+    groups = C.attrs._group_by_(items, 'a')
+    assert list(groups) == [2, 1]
+    assert [i.b for i in groups[1]] == [2, 1]
+
+    assert [i.b for i in C.attrs._filter_(items, a=2)] == [1, 0]
+    assert [i.b for i in C.attrs._filter_(items, a=1, b=1)] == [1]
+
+
+@container
+class Point:
+    x = Attr(fmt='d')
+    y = Attr(fmt='q', default=0)
+    label = Attr()
+
+    @Attr(fmt='d')
+    def scaled(self, attr):
+        return self.x * 2
+
+
+def test_column():
+    points = [Point(x=float(i), y=i) for i in range(5)] + [Point(x=1.5)]
+
+    xs = Point.attrs._column_(points, 'x')
+    assert xs.typecode == 'd'
+    assert list(xs) == [0.0, 1.0, 2.0, 3.0, 4.0, 1.5]
+    assert memoryview(xs).format == 'd'
+
+    assert list(Point.attrs._column_(points, 'y')) == [0, 1, 2, 3, 4, 0]
+    assert list(Point.attrs._column_(points, 'y', typecode='d')) == [0.0, 1.0, 2.0, 3.0, 4.0, 0.0]
+    assert list(Point.attrs._column_(points, 'scaled')) == [0.0, 2.0, 4.0, 6.0, 8.0, 3.0]
+    assert list(Point.attrs._column_(iter(points[:2]), 'x')) == [0.0, 1.0]
+
+
+def test_column_of_subclass_instances():
+    class Point3(Point):
+        z = Attr(fmt='d')
+
+    assert list(Point.attrs._column_([Point(x=1.0), Point3(x=2.0)], 'x')) == [1.0, 2.0]
+
+
+def test_column_requires_typecode():
+    with pytest.raises(TypeError):
+        Point.attrs._column_([Point(label='a')], 'label')
+
+    with pytest.raises(TypeError):
+        Point.attrs._column_([Point()], 'x')
+
+    @container
+    class Pair:
+        xy = Attr(fmt='qQ')
+
+    with pytest.raises(TypeError):
+        Pair.attrs._column_([Pair(xy=(1, 2))], 'xy')
+
+
+def test_columns():
+    points = (Point(x=float(i), y=i, label=i) for i in range(3))
+
+    columns = Point.attrs._columns_(points, 'x', 'y', 'label', typecodes={'label': 'b'})
+    assert list(columns) == ['x', 'y', 'label']
+    assert [c.typecode for c in columns.values()] == ['d', 'q', 'b']
+    assert list(columns['x']) == [0.0, 1.0, 2.0]
+    assert list(columns['label']) == [0, 1, 2]
+
+
+def test_sort_benchmark_runs():
+    from .benchmark_sort import make_records, measure_sort
+
+    assert all(t > 0 for t in measure_sort(make_records(100)))
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import wr_attrs
+
+# Generous, so that only a new heavy import (inspect alone takes ~10ms) trips it
+IMPORT_TIME_BUDGET_US = 50000
+
+HEAVY_MODULES = ('collections', 'inspect', 'json', 'threading', 'weakref', 'dis', 'tokenize', 'enum')
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(wr_attrs.__file__)))
+
+
+def run_python(*args):
+    env = dict(os.environ, PYTHONPATH=PACKAGE_DIR)
+    return subprocess.run(
+        [sys.executable] + list(args), env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+    )
+
+
+def test_import_does_not_load_heavy_modules():
+    result = run_python('-c', (
+        'import sys\n'
+        'before = set(sys.modules)\n'
+        'import wr_attrs\n'
+        'print("\\n".join(sorted(set(sys.modules) - before)))\n'
+    ))
+    imported = set(result.stdout.split())
+    assert imported.isdisjoint(HEAVY_MODULES), imported & set(HEAVY_MODULES)
+
+
+def test_import_time_budget():
+    result = run_python('-X', 'importtime', '-c', 'import wr_attrs')
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative_us, name = line.split('|')
+            if cumulative_us.strip().isdigit():
+                cumulative[name.strip()] = int(cumulative_us)
+    assert cumulative['wr_attrs'] < IMPORT_TIME_BUDGET_US
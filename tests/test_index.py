@@ -0,0 +1,147 @@
+import gc
+
+import pytest
+
+from wr_attrs import Attr, container
+from wr_attrs.index import ContainerIndex
+
+
+@container
+class User:
+    id = Attr()
+    email = Attr()
+    status = Attr(default='active')
+    age = Attr()
+
+
+def test_lookup_by_value():
+    a, b, c = User(id=1, email='a@x'), User(id=2, email='b@x', status='banned'), User(id=3, email='c@x')
+    by_email = ContainerIndex(User, on=('email',), unique=True, instances=[a, b, c])
+    by_status = ContainerIndex(User, on='status', instances=[a, b, c])
+
+    assert len(by_email) == 3
+    assert b in by_email
+    assert by_email.get('b@x') is b
+    assert by_email.get('d@x') is None
+    assert by_status.find('active') == [a, c]
+    assert by_status.find('deleted') == []
+
+
+def test_unique_violation_is_rejected():
+    a, b = User(email='a@x'), User(email='b@x')
+    by_email = ContainerIndex(User, on=('email',), unique=True, instances=[a, b])
+
+    with pytest.raises(ValueError):
+        by_email.add(User(email='a@x'))
+
+    with pytest.raises(ValueError):
+        b.email = 'a@x'
+    assert b.email == 'b@x'
+    assert by_email.get('b@x') is b
+
+    b.email = 'b@x'
+    assert by_email.get('b@x') is b
+
+
+def test_index_follows_writes():
+    a, b = User(id=1, status='active'), User(id=2, status='active')
+    by_status = ContainerIndex(User, on=('status',), instances=[a, b])
+    by_id_status = ContainerIndex(User, on=('id', 'status'), unique=True, instances=[a, b])
+
+    a.status = 'banned'
+    b.attrs.set('id', 3)
+
+    assert by_status.find('active') == [b]
+    assert by_status.find('banned') == [a]
+    assert by_id_status.get(1, 'banned') is a
+    assert by_id_status.get(3, 'active') is b
+    assert by_id_status.get(2, 'active') is None
+
+    b.attrs._reset_(id=4)
+    assert by_id_status.get(4, 'active') is b
+
+    by_status.discard(a)
+    a.status = 'active'
+    assert by_status.find('active') == [b]
+
+
+def test_sorted_range():
+    users = [User(id=i, age=age) for i, age in enumerate([30, 18, 65, 42, 18])]
+    by_age = ContainerIndex(User, on=('age',), sorted=True, instances=users)
+
+    assert [u.age for u in by_age.range(18, 42)] == [18, 18, 30, 42]
+    assert [u.age for u in by_age.range(lo=40)] == [42, 65]
+    assert [u.age for u in by_age.range(hi=17)] == []
+
+    users[2].age = 20
+    assert [u.age for u in by_age.range(19, 30)] == [20, 30]
+
+    with pytest.raises(TypeError):
+        ContainerIndex(User, on=('age',)).range(1, 2)
+
+
+def test_released_instance_leaves_indexes():
+    @container
+    class P:
+        x = Attr()
+
+    p = P(x=1)
+    index = ContainerIndex(P, on='x', instances=[p])
+    P.attrs._release_(p)
+    assert p not in index
+    assert index.find(1) == []
+
+
+def test_subclass_instances_and_dead_indexes():
+    class Admin(User):
+        level = Attr()
+
+    admin = Admin(email='root@x')
+    by_email = ContainerIndex(User, on=('email',), instances=[admin])
+    admin.email = 'admin@x'
+    assert by_email.get('admin@x') is admin
+
+    del by_email
+    gc.collect()
+    admin.email = 'other@x'
+    assert admin.email == 'other@x'
+
+
+def test_optional_attributes_in_sorted_index():
+    a, b = User(id=1, age=1), User(id=2)
+    by_age = ContainerIndex(User, on=('age',), sorted=True, instances=[a, b])
+    by_id_age = ContainerIndex(User, on=('id', 'age'), sorted=True, instances=[a, b])
+
+    assert by_age.find(None) == [b]
+    assert by_age.range() == [a]
+    assert by_id_age.range() == [a]
+
+    b.age = 3
+    assert by_age.range(2) == [b]
+    assert by_id_age.range((2, 0)) == [b]
+
+    b.age = None
+    assert by_age.range() == [a]
+    assert by_age.find(None) == [b]
+
+
+def test_keys_that_can_not_be_indexed_leave_everything_unchanged():
+    a, b = User(id=1, age=1), User(id=2, age=2)
+    by_age = ContainerIndex(User, on=('age',), sorted=True, instances=[a, b])
+    by_status = ContainerIndex(User, on='status', instances=[a, b])
+
+    with pytest.raises(TypeError):
+        b.age = 'old'
+    assert b.age == 2
+
+    with pytest.raises(TypeError):
+        b.status = ['unhashable']
+    assert b.status == 'active'
+
+    with pytest.raises(TypeError):
+        by_age.add(User(age='young'))
+    assert len(by_age) == 2
+
+    b.age = 3
+    assert by_age.range() == [a, b]
+    assert by_status.find('active') == [a, b]
@@ -0,0 +1,120 @@
+import sys
+
+import pytest
+
+from wr_attrs import Attr, container
+from wr_attrs.nested import get_nested
+
+
+@container
+class Item:
+    name = Attr(required=True)
+    qty = Attr(default=1)
+
+
+@container
+class Node:
+    label = Attr()
+    child = Attr(container=Item)
+    items = Attr(list_of=Item)
+
+
+@container
+class Link:
+    value = Attr(required=True)
+    next = Attr(container=None)
+
+
+Link.attrs.next.container = Link
+
+
+def test_nested_attrs_are_recorded():
+    assert get_nested(Node) == {'child': ('container', Item), 'items': ('list_of', Item)}
+    assert get_nested(Item) == {}
+
+    class SubNode(Node):
+        label = 'sub'
+
+    assert get_nested(SubNode) == get_nested(Node)
+    assert get_nested(Link) == {'next': ('container', Link)}
+
+
+def test_to_dict():
+    node = Node(label='a', child=Item(name='x'), items=[Item(name='y', qty=2), Item(name='z')])
+    assert node.attrs._to_dict_() == {
+        'label': 'a',
+        'child': {'name': 'x', 'qty': 1},
+        'items': [{'name': 'y', 'qty': 2}, {'name': 'z', 'qty': 1}],
+    }
+
+
+def test_to_dict_shares_exported_instances():
+    item = Item(name='x')
+    exported = Node(child=item, items=[item]).attrs._to_dict_()
+    assert exported['child'] is exported['items'][0]
+
+
+def test_from_dict():
+    node = Node.attrs._from_dict_({
+        'label': 'a',
+        'child': {'name': 'x'},
+        'items': [{'name': 'y', 'qty': 2}, Item(name='z')],
+    })
+    assert isinstance(node, Node)
+    assert isinstance(node.child, Item)
+    assert (node.child.name, node.child.qty) == ('x', 1)
+    assert [(i.name, i.qty) for i in node.items] == [('y', 2), ('z', 1)]
+
+    with pytest.raises(TypeError):
+        Node.attrs._from_dict_({'unknown': 1})
+
+
+def test_deep_copy():
+    node = Node(label=['a'], child=Item(name='x'), items=[Item(name='y')])
+    copied = node.attrs._deep_copy_()
+
+    assert copied.attrs._to_dict_() == node.attrs._to_dict_()
+    assert copied.child is not node.child
+    assert copied.items[0] is not node.items[0]
+    assert copied.items is not node.items
+    assert copied.label is node.label
+    assert copied.child.attrs.owner is copied.child
+
+    copied.child.name = 'changed'
+    assert node.child.name == 'x'
+
+
+def test_validate():
+    Node(child=Item(name='x'), items=[]).attrs._validate_()
+
+    node = Node(child=Item(), items=[Item(name='y'), Item()])
+    with pytest.raises(ValueError) as exc_info:
+        node.attrs._validate_()
+    assert 'child.name, items[1].name' in str(exc_info.value)
+
+
+def test_deep_trees_do_not_hit_recursion_limit():
+    depth = sys.getrecursionlimit() * 2
+
+    data = {'value': 0}
+    for i in range(1, depth):
+        data = {'value': i, 'next': data}
+
+    head = Link.attrs._from_dict_(data)
+    assert head.next.next.value == depth - 3
+
+    exported = head.attrs._to_dict_()
+    assert exported['next']['next']['value'] == depth - 3
+
+    copied = head.attrs._deep_copy_()
+    assert copied.next is not head.next
+    assert copied.next.next.value == depth - 3
+
+    head.attrs._validate_()
+
+    data = {}
+    for i in range(depth):
+        data = {'value': i, 'next': data}
+    with pytest.raises(ValueError) as exc_info:
+        Link.attrs._from_dict_(data).attrs._validate_()
+    assert str(exc_info.value).endswith('.next.next.value')
@@ -1,3 +1,7 @@
+import functools
+import threading
+from copy import copy
+
 from wr_attrs import Attr, container
 
 
@@ -69,3 +73,157 @@ def test_set_value_decorator():
 
     c.y = 5
     assert c.y == 10
+
+
+def test_pure_get_value_decorator():
+    calls = []
+
+    @container
+    class C:
+        amount = Attr()
+        currency = Attr()
+
+        @Attr.get_value(pure=True, key=('amount', 'currency'), maxsize=2)
+        def formatted(self, attr):
+            calls.append(1)
+            return '{} {}'.format(self.amount, self.currency)
+
+        y = Attr()
+
+        @y.get_value(pure=True)
+        def y(self, attr):
+            calls.append(1)
+            return attr.value * 2
+
+    cache = C.attrs.formatted.get_value_cache
+
+    assert C(amount=1, currency='EUR').formatted == '1 EUR'
+    assert C(amount=1, currency='EUR').formatted == '1 EUR'
+    assert len(calls) == 1
+    assert cache.stats() == {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+    c = C(amount=1, currency='EUR')
+    c.amount = 2
+    assert c.formatted == '2 EUR'
+    assert C(amount=3, currency='EUR').formatted == '3 EUR'
+    assert cache.stats() == {'size': 2, 'hits': 1, 'misses': 3, 'evictions': 1}
+
+    assert C(y=5).y == 10
+    assert C(y=5).y == 10
+    assert C(y=6).y == 12
+    assert C.attrs.y.get_value_cache.stats()['hits'] == 1
+
+
+def test_pure_get_value_keys_by_type():
+    @container
+    class C:
+        @Attr.get_value(pure=True)
+        def x(self, attr):
+            return '{!r}'.format(attr.value)
+
+    assert [C(x=v).x for v in (1, 1.0, True, 1)] == ['1', '1.0', 'True', '1']
+    assert C.attrs.x.get_value_cache.stats()['size'] == 3
+
+
+def test_pure_get_value_cache_is_not_shared_with_subclass_overrides():
+    @container
+    class C:
+        @Attr.get_value(pure=True)
+        def x(self, attr):
+            return attr.value
+
+    class D(C):
+        x = 5
+
+    assert D().x == 5
+    assert D.attrs.x.get_value_cache is not C.attrs.x.get_value_cache
+    assert C.attrs.x.get_value_cache.stats()['size'] == 0
+    assert D.attrs.x.get_value_cache.stats()['size'] == 1
+
+
+def test_pure_get_value_with_unhashable_key():
+    @container
+    class C:
+        @Attr.get_value(pure=True)
+        def x(self, attr):
+            return len(attr.value)
+
+    assert C(x=[1, 2]).x == 2
+    assert C.attrs.x.get_value_cache.stats()['size'] == 0
+
+
+def test_redecorated_get_value_drops_cache():
+    @container
+    class C:
+        @Attr.get_value(pure=True)
+        def x(self, attr):
+            return 1
+
+    class D(C):
+        x = copy(C.x)
+
+        @x.get_value
+        def x(self, attr):
+            return 2
+
+    assert C().x == 1
+    assert D().x == 2
+    assert D.attrs.x.get_value_cache is None
+
+
+def test_wrapped_hooks_are_passed_extras_of_the_wrapped_function():
+    calls = []
+
+    def logged(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+        return wrapper
+
+    @container
+    class C:
+        @Attr.get_value
+        @logged
+        def x(self, attr):
+            return (attr.value or 0) + 1
+
+        y = Attr()
+
+        @y.set_value
+        @logged
+        def y(attr, value):
+            attr.value = value * 2
+
+    c = C()
+    assert c.x == 1
+    c.y = 3
+    assert c.y == 6
+    assert calls == ['x', 'y']
+
+
+def test_pure_get_value_cache_under_threads():
+    @container
+    class C:
+        @Attr.get_value(pure=True, maxsize=4)
+        def x(self, attr):
+            return (attr.value or 0) * 2
+
+    errors = []
+
+    def read():
+        try:
+            for i in range(5000):
+                c = C()
+                c.attrs.x.value = i % 16
+                assert c.x == i % 16 * 2
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
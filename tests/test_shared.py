@@ -0,0 +1,106 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from wr_attrs import Attr, container
+
+# multiprocessing.shared_memory is new in Python 3.8
+pytest.importorskip('multiprocessing.shared_memory')
+
+from wr_attrs.shared import SharedArray  # noqa: E402
+
+
+@container
+class Sample:
+    x = Attr(fmt='d')
+    n = Attr(fmt='q', default=0)
+
+
+def _double_x(array, index):
+    # Runs in a worker process, attached to the array by unpickling it
+    try:
+        array[index].x *= 2
+        return array[index].n
+    finally:
+        array.close()
+
+
+def test_from_instances_and_views():
+    samples = [Sample(x=i / 2, n=i) for i in range(10)]
+
+    with SharedArray.from_instances(Sample, samples) as array:
+        assert len(array) == 10
+        assert [(s.x, s.n) for s in array] == [(i / 2, i) for i in range(10)]
+        assert array[-1].n == 9
+
+        array[3].n = 300
+        assert array.columns['n'][3] == 300
+
+        loaded = array.load(3)
+        assert isinstance(loaded, Sample)
+        assert (loaded.x, loaded.n) == (1.5, 300)
+
+        with pytest.raises(IndexError):
+            _ = array[10]  # noqa
+
+
+def test_attach_shares_memory():
+    with SharedArray.create(Sample, 3) as array:
+        writer = SharedArray.attach(Sample, array.name, 3, readonly=False)
+        writer[1].x = 2.5
+        assert array[1].x == 2.5
+
+        attached = SharedArray.attach(Sample, array.name, 3)
+        reader = pickle.loads(pickle.dumps(attached))
+        attached.close()
+        assert reader.readonly
+        assert reader[1].x == 2.5
+        with pytest.raises(TypeError):
+            reader[1].x = 1.0
+
+        writer.close()
+        reader.close()
+
+
+def test_none_values_cannot_be_stored():
+    with SharedArray.create(Sample, 2) as array:
+        array[0].n = 7
+        with pytest.raises(ValueError) as exc_info:
+            array.store(0, Sample(n=5))
+        assert 'x' in str(exc_info.value)
+        assert array[0].n == 7
+
+    with pytest.raises(ValueError):
+        SharedArray.from_instances(Sample, [Sample(x=1.0), Sample()])
+
+
+def test_non_numeric_attributes_cannot_be_shared():
+    @container
+    class C:
+        x = Attr(fmt='d')
+        label = Attr()
+
+    with pytest.raises(TypeError) as exc_info:
+        SharedArray.create(C, 1)
+    assert 'C.label must declare a numeric fmt= option' in str(exc_info.value)
+
+
+def test_worker_processes_attach_to_shared_memory():
+    samples = [Sample(x=float(i), n=i * 10) for i in range(4)]
+
+    with SharedArray.from_instances(Sample, samples) as array:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_double_x, [array] * len(array), range(len(array))))
+
+        assert results == [0, 10, 20, 30]
+        assert [s.x for s in array] == [0.0, 2.0, 4.0, 6.0]
+
+
+def test_multi_value_formats_cannot_be_shared():
+    @container
+    class C:
+        xy = Attr(fmt='hH')
+
+    with pytest.raises(TypeError):
+        SharedArray.create(C, 1)
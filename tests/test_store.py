@@ -0,0 +1,113 @@
+import pytest
+
+from wr_attrs import Attr, container
+from wr_attrs.store import RecordStore
+
+
+@container
+class Event:
+    ts = Attr(fmt='q')
+    value = Attr(fmt='d')
+    code = Attr(fmt='4s')
+    message = Attr(fmt='str')
+    payload = Attr(fmt='bytes')
+
+
+def make_event(i):
+    return Event(ts=i, value=i / 4, code=b'E%03d' % i, message='event {}'.format(i), payload=bytes([i]) * i)
+
+
+def test_append_and_read(tmp_path):
+    path = str(tmp_path / 'events')
+
+    with RecordStore(Event, path, batch_size=3) as store:
+        assert len(store) == 0
+        store.extend(make_event(i) for i in range(5))
+        assert len(store) == 3
+        store.flush()
+        assert len(store) == 5
+
+        e = store[4]
+        assert (e.ts, e.value, e.code, e.message, e.payload) == (4, 1.0, b'E004', 'event 4', b'\x04' * 4)
+        assert [e.ts for e in store] == [0, 1, 2, 3, 4]
+        assert store[-1].ts == 4
+
+        with pytest.raises(IndexError):
+            _ = store[5]  # noqa
+
+
+def test_reopen_and_append(tmp_path):
+    path = str(tmp_path / 'events')
+
+    with RecordStore(Event, path) as store:
+        store.extend(make_event(i) for i in range(3))
+
+    with RecordStore(Event, path) as store:
+        assert len(store) == 3
+        store.append(make_event(3))
+        store.flush()
+        assert [e.message for e in store] == ['event 0', 'event 1', 'event 2', 'event 3']
+
+        loaded = store.load(3)
+        assert isinstance(loaded, Event)
+        assert (loaded.ts, loaded.payload) == (3, b'\x03' * 3)
+
+
+def test_none_values(tmp_path):
+    with RecordStore(Event, str(tmp_path / 'events')) as store:
+        store.append(Event(ts=1))
+        store.flush()
+        e = store[0]
+        assert (e.ts, e.value, e.code, e.message, e.payload) == (1, None, None, None, None)
+
+
+def test_reopen_with_other_schema(tmp_path):
+    @container
+    class Other:
+        ts = Attr(fmt='q')
+
+    path = str(tmp_path / 'events')
+    RecordStore(Event, path).close()
+
+    with pytest.raises(ValueError):
+        RecordStore(Other, path)
+
+
+def test_reopen_with_other_formats(tmp_path):
+    def make_cls(fmt):
+        @container
+        class Note:
+            text = Attr(fmt=fmt)
+        return Note
+
+    path = str(tmp_path / 'notes')
+    with RecordStore(make_cls('str'), path) as store:
+        store.append(make_cls('str')(text='hi'))
+
+    with pytest.raises(ValueError):
+        RecordStore(make_cls('bytes'), path)
+
+
+def test_values_that_can_not_be_stored_are_rejected_on_append(tmp_path):
+    store = RecordStore(Event, str(tmp_path / 'events'), batch_size=2)
+    store.append(Event(ts=1))
+    for event in [Event(ts='x'), Event(message=b'not str'), Event(payload=5), Event(code='abcd')]:
+        with pytest.raises(ValueError):
+            store.append(event)
+    store.append(Event(ts=2))
+    store.close()
+    assert store._file.closed
+
+    with RecordStore(Event, str(tmp_path / 'events')) as store:
+        assert [e.ts for e in store] == [1, 2]
+
+
+def test_attrs_without_storable_fmt():
+    @container
+    class C:
+        x = Attr(fmt='dd')
+        y = Attr()
+
+    with pytest.raises(TypeError) as exc_info:
+        RecordStore(C, 'unused')
+    assert 'C.x must declare a fmt= option of a single value' in str(exc_info.value)
@@ -1,12 +1,13 @@
 __version__ = '3.3.1'
 
 
-from .attrs3 import Attr, Attrs, BoundAttr, NotSet, Required, container
+from .attrs3 import Attr, Attrs, BoundAttr, InternTable, NotSet, Required, container
 
 __all__ = [
     'Attr',
     'Attrs',
     'BoundAttr',
+    'InternTable',
     'NotSet',
     'Required',
     'container',
@@ -7,23 +7,114 @@ Layers starting from lowest:
     2. Attrs.get, Attrs.set
 
 """
-import collections
-import inspect
-from copy import copy
-
 ATTRS_FOR_CONTAINER_CLS = '_attrs_for_cls_'
 ATTRS_FOR_CONTAINER_INSTANCE = '_attrs_'
 ATTRS_ALL_NAMES = '_attrs_all_names_'
+ATTRS_CLASS_CACHE = '_attrs_cache_'
+ATTRS_NESTED = '_attrs_nested_'
+ATTRS_INDEXES = '_attrs_indexes_'
+
+# Bitset of required attributes of an instance which have no value, bits in the order of get_required_names().
+# Stored in the instance __dict__ once attrs._missing_() has been called, and kept up to date on writes after that.
+# Stored as (required_version, bitset): a bitset from before a change of Attr.required is recomputed.
+ATTRS_MISSING = '_attrs_missing_'
+
+# Incremented whenever Attr.required of any attribute changes, which invalidates get_required_names().
+required_version = 0
+
+# Options of Attrs holding other containers: Attr(container=SubCls), Attr(list_of=SubCls).
+# The option may be None at class creation and set later, e.g. for a class referencing itself.
+NESTED_KINDS = ('container', 'list_of')
+
+JSONL_CHUNK_SIZE = 64 * 1024
+
+
+def get_storage_name(container_cls, attr_name):
+    """
+    Returns the key under which instances of container_cls store the value of attr_name in their __dict__.
+    """
+    return '{}#{}'.format(container_cls.__name__, attr_name)
+
+
+def get_storage_names(container_cls):
+    """
+    Returns storage names of all attributes of container_cls.
+    """
+    cache = get_class_cache(container_cls)
+    if 'storage_names' not in cache:
+        cache['storage_names'] = tuple(
+            get_storage_name(container_cls, name) for name in getattr(container_cls, ATTRS_ALL_NAMES)
+        )
+    return cache['storage_names']
+
+
+def get_required_names(container_cls):
+    """
+    Returns names of required attributes of container_cls.
+    """
+    cache = get_class_cache(container_cls)
+    version, names = cache.get('required_names', (None, None))
+    if version != required_version:
+        names = tuple(
+            name for name in getattr(container_cls, ATTRS_ALL_NAMES) if getattr(container_cls, name).required
+        )
+        cache['required_names'] = required_version, names
+    return names
+
+
+def get_class_cache(container_cls):
+    """
+    Returns a dictionary for helpers derived from container_cls (codecs etc.)
+    which is specific to container_cls and not inherited by its subclasses.
+    """
+    if ATTRS_CLASS_CACHE not in container_cls.__dict__:
+        setattr(container_cls, ATTRS_CLASS_CACHE, {})
+    return container_cls.__dict__[ATTRS_CLASS_CACHE]
+
+
+def get_indexes(container_cls):
+    """
+    Returns live indexes (see wr_attrs.index) of container_cls and its base classes.
+    """
+    return [index for cls in container_cls.__mro__ for index in cls.__dict__.get(ATTRS_INDEXES) or ()]
+
+
+FunctionType = type(get_storage_name)
+
+# Names of parameters that can be passed as keyword arguments, by code object of plain functions
+_keyword_names = {}
+
+
+def get_keyword_names(func):
+    """
+    Returns names of parameters of function func that can be passed as keyword arguments,
+    read from its code object.
+    """
+    code = func.__code__
+    try:
+        return _keyword_names[code]
+    except KeyError:
+        start = getattr(code, 'co_posonlyargcount', 0)
+        names = frozenset(code.co_varnames[start:code.co_argcount + code.co_kwonlyargcount])
+        return _keyword_names.setdefault(code, names)
 
 
 def invoke_with_extras(func, **extras):
     """
     Invoke the function with extras populating any corresponding args or kwargs.
     """
+    # The signature of a plain function is the one of its code object, unless the function
+    # is a wrapper declaring the signature of another function (functools.wraps etc.)
+    if type(func) is FunctionType and '__wrapped__' not in func.__dict__ and '__signature__' not in func.__dict__:
+        names = get_keyword_names(func)
+        return func(**{k: v for k, v in extras.items() if k in names})
+
+    # Methods, partials, wrapped functions, callable objects: inspect is only imported for these.
+    import inspect
     signature = inspect.signature(func)  # type: inspect.Signature
 
     bound_args = signature.bind(
-        **{k: extras.pop(k) for k in list(extras.keys()) if k in signature.parameters}
+        **{k: v for k, v in extras.items() if k in signature.parameters}
     )  # type: inspect.BoundArguments
     return func(*bound_args.args, **bound_args.kwargs)
 
@@ -43,6 +134,27 @@ def process_fattr_decorator(decorator_name, args):
         return attr
 
 
+def iter_lines(fileobj, chunk_size=JSONL_CHUNK_SIZE):
+    """
+    Yields non-blank lines of a text or binary file object read in chunks of chunk_size,
+    as str: lines of binary files are decoded from UTF-8.
+    """
+    tail = None
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        if tail:
+            chunk = tail + chunk
+        lines = chunk.split(b'\n' if isinstance(chunk, bytes) else '\n')
+        tail = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line.decode('utf-8') if isinstance(line, bytes) else line
+    if tail and tail.strip():
+        yield tail.decode('utf-8') if isinstance(tail, bytes) else tail
+
+
 class _Falsey:
     def __init__(self, name):
         self._name = name
@@ -62,14 +174,154 @@ Required = _Falsey('Required')
 TempValue = _Falsey('TempValue')
 
 
+class InternTable:
+    """
+    Flyweight table which maps equal values to one shared instance.
+
+    ``Attr(intern=True)`` gives the attribute a table of its own,
+    ``Attr(intern=table)`` shares table between attributes.
+
+    Only values of types whose equal values are interchangeable (str, bytes, int, bool) are interned.
+    Values of other types are stored as they are: equal floats, decimals or tuples
+    can still differ (-0.0 and 0.0, Decimal('1.0') and Decimal('1.00'), (1,) and (1.0,)).
+    With maxsize set, the table stops growing when full, and values not already in it are stored as they are.
+    """
+
+    # Exact types, not subclasses, which may redefine equality
+    types = frozenset((str, bytes, int, bool))
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, value):
+        if value.__class__ not in self.types:
+            return value
+        # Keyed by type too as equal values of different types (1, True) must not be merged.
+        key = (value.__class__, value)
+        try:
+            interned = self.values[key]
+        except KeyError:
+            self.misses += 1
+            if self.maxsize is None or len(self.values) < self.maxsize:
+                self.values[key] = value
+            return value
+        self.hits += 1
+        return interned
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return '<{} size={} hits={} misses={}>'.format(self.__class__.__name__, len(self), self.hits, self.misses)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {'size': len(self), 'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
+
+    def clear(self):
+        self.values.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class GetValueCache:
+    """
+    Bounded LRU cache of results of a pure get_value hook, shared by all instances
+    of the container class. Results are keyed by the values and types of the attributes
+    named in key (by default the attribute itself), so they never need to be invalidated.
+    Equal values of different types (1, 1.0, True) have separate results.
+
+    Copies of the Attr, including the ones created for subclasses overriding its default,
+    get an empty cache of their own.
+    """
+
+    def __init__(self, key=None, maxsize=128):
+        self.key = tuple(key) if key else None
+        self.maxsize = maxsize
+        # Imported here rather than at module level to keep import of wr_attrs light
+        from collections import OrderedDict
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return '<{} size={} hits={} misses={} evictions={}>'.format(
+            self.__class__.__name__, len(self.results), self.hits, self.misses, self.evictions,
+        )
+
+    def get(self, attr, instance):
+        attrs = instance.attrs
+        key = []
+        for name in self.key or (attr.name,):
+            value = attrs[name].value
+            key.append((value.__class__, value))
+        key = tuple(key)
+        try:
+            result = self.results[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable values can't be cached
+            return invoke_with_extras(attr._f_get_value, self=instance, attr=attrs[attr.name])
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = invoke_with_extras(attr._f_get_value, self=instance, attr=attrs[attr.name])
+        self.results[key] = result
+        if self.maxsize is not None and len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def __copy__(self):
+        return self.__class__(key=self.key, maxsize=self.maxsize)
+
+    def stats(self):
+        return {'size': len(self.results), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def clear(self):
+        self.results.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class _AttrRecord:
+    """
+    Read-only snapshot of the fields and options of an Attr.
+
+    BoundAttr delegates reads of Attr metadata (.default, .required, options)
+    to the record so that they are plain attribute lookups.
+    The record is kept up to date by Attr.__setattr__.
+    """
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is read-only'.format(self.__class__.__name__))
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(self.__class__.__name__, self.__dict__.get('name'))
+
+
 class Attr:
     _internals_ = (
-        'name', 'required', 'default', '_f_get_value', '_f_set_value', '_f_init_value', 'options',
+        'name', 'required', 'default', 'default_factory', 'intern',
+        '_f_get_value', '_f_set_value', '_f_init_value', 'get_value_cache', 'options',
     )
 
     def __init__(
             self, *args,
-            name=None, default=NotSet, required=False,
+            name=None, default=NotSet, required=False, default_factory=None, intern=False,
             get_value=None, set_value=None, init_value=None,
             **options
     ):
@@ -86,6 +338,8 @@ class Attr:
             else:
                 raise TypeError('Unrecognised args: {}'.format(args))
 
+        super().__setattr__('_record_', _AttrRecord())
+
         self.name = name  # type: str
 
         self.required = bool(required)
@@ -97,12 +351,30 @@ class Attr:
         else:
             if self.required:
                 raise ValueError('default= must not be set together with required=True')
+            if default_factory is not None:
+                raise ValueError('default= must not be set together with default_factory=')
             self.default = default
 
+        if default_factory is not None and self.required:
+            raise ValueError('default_factory= must not be set together with required=True')
+
+        # Called to create the default value of each instance, for defaults that are mutable
+        self.default_factory = default_factory  # type: callable
+
+        # Values set are replaced with the equal value from this table
+        if intern is True:
+            intern = InternTable()
+        elif intern is False:
+            intern = None
+        self.intern = intern  # type: InternTable
+
         self._f_get_value = get_value  # type: callable
         self._f_set_value = set_value  # type: callable
         self._f_init_value = init_value  # type: callable
 
+        # Set for get_value hooks declared pure
+        self.get_value_cache = None  # type: GetValueCache
+
         self.options = options
 
     def __set__(self, instance, value):
@@ -119,6 +391,8 @@ class Attr:
         else:
             if self._f_get_value is None:
                 return instance.attrs.get(self.name)
+            elif self.get_value_cache is not None:
+                return self.get_value_cache.get(self, instance)
             else:
                 return invoke_with_extras(self._f_get_value, self=instance, attr=instance.attrs[self.name])
 
@@ -130,31 +404,114 @@ class Attr:
 
     def __call__(self, get_value_method):
         self._f_get_value = get_value_method
+        self.get_value_cache = None
         return self
 
     def init_value(*args):
         return process_fattr_decorator('init_value', args)
 
-    def get_value(*args):
-        return process_fattr_decorator('get_value', args)
+    def get_value(*args, pure=False, key=None, maxsize=128):
+        """
+        Decorator of the get_value hook. ``@x.get_value(pure=True, key=('a', 'b'), maxsize=N)``
+        declares the hook a pure function of the stored values of attributes a and b,
+        and caches its results in a GetValueCache of maxsize entries.
+        """
+        if pure:
+            def decorator(func):
+                attr = Attr.get_value(*(args + (func,)))
+                attr.get_value_cache = GetValueCache(key=key, maxsize=maxsize)
+                return attr
+            return decorator
+
+        attr = process_fattr_decorator('get_value', args)
+        attr.get_value_cache = None
+        return attr
 
     def set_value(*args):
         return process_fattr_decorator('set_value', args)
 
     def __getattr__(self, name):
-        if name == 'options':  # avoid recursion due to copying
-            raise AttributeError('options')
+        if name in ('options', '_record_', '_children_', '_overrides_'):  # avoid recursion when not initialised
+            raise AttributeError(name)
         if name in self.options:
             return self.options[name]
         raise AttributeError(name)
 
     def __setattr__(self, name, value):
-        if name in self._internals_:
+        if name not in self._internals_ and name not in self.options:
+            raise AttributeError(name)
+        if '_overrides_' in self.__dict__:
+            self._overrides_.add(name)
+        self._apply_(name, value)
+
+    def _apply_(self, name, value):
+        if name == 'required':
+            global required_version
+            required_version += 1
+
+        if name == 'options':
             super().__setattr__(name, value)
-        elif name in self.options:
-            self.options[name] = value
+            self._sync_record_()
+        elif name in self._internals_:
+            super().__setattr__(name, value)
+            self._record_.__dict__[name] = value
         else:
-            raise AttributeError(name)
+            self.options[name] = value
+            self._record_.__dict__[name] = value
+
+        for child in self.__dict__.get('_children_', ()):
+            if name == 'options':
+                options = dict(value)
+                options.update((k, v) for k, v in child.options.items() if k in child._overrides_)
+                child._apply_(name, options)
+            elif name not in child._overrides_:
+                child._apply_(name, value)
+
+    def __copy__(self):
+        attr = self.__class__.__new__(self.__class__)
+        attr.__dict__.update(self.__dict__)
+        attr.__dict__.pop('_children_', None)
+        attr.__dict__.pop('_overrides_', None)
+        attr.__dict__['options'] = dict(self.options)
+        attr.__dict__['_record_'] = record = _AttrRecord()
+        record.__dict__.update(self._record_.__dict__)
+        if self.get_value_cache is not None:
+            attr.__dict__['get_value_cache'] = record.__dict__['get_value_cache'] = self.get_value_cache.__copy__()
+        return attr
+
+    def _override_(self, **fields):
+        """
+        Returns a child of this Attr with fields (Attr fields or options) set to new values.
+
+        Everything that is not overridden is delegated to this Attr: later changes
+        to this Attr are seen by the child unless the child has overridden them.
+        Changes to the child never affect this Attr.
+        """
+        attr = self.__copy__()
+        attr.__dict__['_overrides_'] = set(fields)
+        if '_children_' not in self.__dict__:
+            import weakref
+            self.__dict__['_children_'] = weakref.WeakSet()
+        self._children_.add(attr)
+
+        # Inlined Attr.__setattr__ as this is called for every overridden default of every container subclass.
+        record = attr._record_.__dict__
+        for k, v in fields.items():
+            if k == 'options':
+                attr._apply_(k, v)
+            elif k in self._internals_:
+                attr.__dict__[k] = record[k] = v
+            elif k in attr.options:
+                attr.options[k] = record[k] = v
+            else:
+                raise AttributeError(k)
+        return attr
+
+    def _sync_record_(self):
+        record = self._record_.__dict__
+        record.clear()
+        record.update(self.__dict__.get('options', ()))
+        record.update((k, self.__dict__[k]) for k in self._internals_ if k in self.__dict__)
 
 
 class BoundAttr:
@@ -168,18 +525,21 @@ class BoundAttr:
         # The name under which the attribute value is stored in owner's __dict__
         assert self.owner
         assert self.attr.name
-        self.storage_name = '{}#{}'.format(self.owner.__class__.__name__, self.attr.name)
+        self.storage_name = get_storage_name(self.owner.__class__, self.attr.name)
 
     def __repr__(self):
         return '<{} {}.{}>'.format(self.__class__.__name__, self.owner.__class__.__name__, self.attr.name)
 
     def __getattr__(self, name):
-        return getattr(self.attr, name)
+        try:
+            return getattr(self.attr._record_, name)
+        except AttributeError:
+            return getattr(self.attr, name)
 
     def __setattr__(self, name, value):
         if name in self._internals_:
             super().__setattr__(name, value)
-        elif hasattr(self.attr, name):
+        elif name in self.attr._record_.__dict__:
             if not isinstance(self.owner, type):
                 raise TypeError('Cannot set attribute {!r} on instance-bound Attr {!r}'.format(name, self.attr.name))
             setattr(self.attr, name, value)
@@ -193,45 +553,98 @@ class BoundAttr:
         if isinstance(self.owner, type):
             raise TypeError('Attr has value only when bound to a container instance, not container class')
         else:
-            if not self.has_value_initialised:
+            storage = self.owner.__dict__
+            value = storage.get(self.storage_name, NotSet)
+            if value is NotSet:
+                attr = self.attr
+                if attr._f_init_value is None and attr.default_factory is None:
+                    # Nothing to initialise, the default is shared by all instances.
+                    return attr.default
+                value = TempValue
+            if value is TempValue:
+                # Not initialised, or being initialised (possibly by another thread)
                 self.init_value()
-            return getattr(self.owner, self.storage_name)
+                value = storage[self.storage_name]
+            return value
 
     @value.setter
     def value(self, new):
         # Do not override this logic. Add features in Attrs.set
-        if isinstance(self.owner, type):
-            raise TypeError('{} on class is read-only'.format(self.attr.name))
-        if not self.has_value_initialised:
+        owner = self.owner
+        attr = self.attr
+        if isinstance(owner, type):
+            raise TypeError('{} on class is read-only'.format(attr.name))
+
+        storage = owner.__dict__
+        if attr._f_init_value is not None and self.storage_name not in storage:
             self.init_value(value=new)
 
             # set_value should see the initialised value.
             new = self.value
 
-        setattr(self.owner, self.storage_name, new)
+        if attr.intern is not None:
+            new = attr.intern(new)
+
+        if owner.__class__._attrs_indexes_ is None:
+            storage[self.storage_name] = new
+        else:
+            indexes = [index for index in get_indexes(owner.__class__) if index.covers(owner, attr.name)]
+            for index in indexes:
+                index.check(owner, attr.name, new)
+            storage[self.storage_name] = new
+            for index in indexes:
+                index.reindex(owner)
+
+        if ATTRS_MISSING in storage and attr.required:
+            version, missing = storage[ATTRS_MISSING]
+            if version != required_version:
+                del storage[ATTRS_MISSING]
+            else:
+                bit = 1 << get_required_names(owner.__class__).index(attr.name)
+                if new is Required:
+                    storage[ATTRS_MISSING] = version, missing | bit
+                else:
+                    storage[ATTRS_MISSING] = version, missing & ~bit
 
     @property
     def has_value_initialised(self):
         """
         Returns True if instance has anything stored under the storage_name of this attribute.
         """
-        return hasattr(self.owner, self.storage_name)
+        return self.storage_name in self.owner.__dict__
 
     def init_value(self, value=NotSet):
         """
         Only to be called to set the value the first time
         """
-
-        # Set a temporary value so that initialiser can safely
-        # call value setter and avoid infinite recursion
-        setattr(self.owner, self.storage_name, TempValue)
+        storage = self.owner.__dict__
 
         if value is NotSet:
-            value = self.default
-        if self._f_init_value:
-            invoke_with_extras(self._f_init_value, self=self.owner, attr=self, value=value)
-        else:
-            setattr(self.owner, self.storage_name, value)
+            if self.default_factory is None:
+                value = self.default
+            else:
+                value = self.default_factory()
+
+        if not self._f_init_value:
+            storage.setdefault(self.storage_name, value)
+            return
+
+        # Only one thread runs init_value hooks of an instance at a time.
+        # Other threads reading the value wait here until it is initialised.
+        with self.owner.attrs._init_lock_:
+            if self.storage_name in storage:
+                # Initialised by another thread, or being initialised by this one
+                return
+
+            # Set a temporary value so that initialiser can safely
+            # call value setter and avoid infinite recursion
+            storage[self.storage_name] = TempValue
+            try:
+                invoke_with_extras(self._f_init_value, self=self.owner, attr=self, value=value)
+            except BaseException:
+                if storage.get(self.storage_name) is TempValue:
+                    del storage[self.storage_name]
+                raise
 
 
 class Attrs:
@@ -242,17 +655,29 @@ class Attrs:
         self.bound_attrs = {}
 
     def get(self, attr_name: str):
-        attr = self[attr_name]
+        value = self[attr_name].value
 
-        if attr.required and attr.value is Required:
+        # Only required attributes have Required as their default.
+        if value is Required:
             raise ValueError('Required attr {!r} is missing value'.format(attr_name))
 
-        return attr.value
+        return value
 
     def set(self, attr_name: str, new):
         attr = self[attr_name]
         attr.value = new
 
+    @property
+    def _init_lock_(self):
+        """
+        Re-entrant lock held while init_value hooks of the owner run.
+        """
+        lock = self.__dict__.get('init_lock')
+        if lock is None:
+            import threading
+            lock = self.__dict__.setdefault('init_lock', threading.RLock())
+        return lock
+
     @property
     def _names_(self):
         if isinstance(self.owner, type):
@@ -288,6 +713,174 @@ class Attrs:
         else:
             return self._process_(kwargs)
 
+    def _reset_(self, **values):
+        """
+        Returns the instance to the state of a new instance created with values, in place:
+        stored values of all attributes are cleared, the Attrs and BoundAttrs of the instance are kept.
+        State of the instance other than attribute values is left as it is.
+        """
+        indexes = []
+        if self.owner.__class__._attrs_indexes_ is not None:
+            indexes = [index for index in get_indexes(self.owner.__class__) if self.owner in index]
+            for index in indexes:
+                index.discard(self.owner)
+
+        storage = self.owner.__dict__
+        storage.pop(ATTRS_MISSING, None)
+        for storage_name in get_storage_names(self.owner.__class__):
+            storage.pop(storage_name, None)
+        for k, v in values.items():
+            self[k].value = v
+
+        for index in indexes:
+            index.add(self.owner)
+
+    def _missing_(self):
+        """
+        Returns names of required attributes which have no value.
+        """
+        storage = self.owner.__dict__
+        required_names = get_required_names(self.owner.__class__)
+        version, missing = storage.get(ATTRS_MISSING, (None, None))
+        if version != required_version:
+            missing = 0
+            for i, name in enumerate(required_names):
+                if self[name].value is Required:
+                    missing |= 1 << i
+            storage[ATTRS_MISSING] = required_version, missing
+        if not missing:
+            return []
+        return [name for i, name in enumerate(required_names) if missing >> i & 1]
+
+    def _acquire_(self, **values):
+        """
+        Returns an instance of the container class with values set, taken from the class's pool
+        of released instances if there are any, or created otherwise.
+
+        values are attribute values only, set after the instance is taken or created (without arguments),
+        so __init__ arguments that are not attributes raise AttributeError whether the pool is empty or not.
+        """
+        container_cls = self.owner if isinstance(self.owner, type) else self.owner.__class__
+        try:
+            instance = get_class_cache(container_cls).setdefault('pool', []).pop()
+        except IndexError:
+            instance = container_cls()
+        attrs = instance.attrs
+        for k, v in values.items():
+            attrs[k].value = v
+        return instance
+
+    def _release_(self, instance):
+        """
+        Resets instance and returns it to the class's pool, which holds up to attrs_pool_size instances.
+        The instance is removed from all indexes and must not be used after it has been released.
+        """
+        container_cls = self.owner if isinstance(self.owner, type) else self.owner.__class__
+        if instance.__class__ is not container_cls:
+            raise TypeError('Cannot release {!r} to the pool of {}'.format(instance, container_cls.__name__))
+        pool = get_class_cache(container_cls).setdefault('pool', [])
+        # The pool is small, an identity scan is cheaper than marking released instances
+        if any(pooled is instance for pooled in pool):
+            raise ValueError('{!r} has already been released'.format(instance))
+        if container_cls._attrs_indexes_ is not None:
+            for index in get_indexes(container_cls):
+                index.discard(instance)
+        instance.attrs._reset_()
+        if len(pool) < container_cls.attrs_pool_size:
+            pool.append(instance)
+
+    def _iter_jsonl_(self, fileobj, ignore_unknown=False, collect_unknown=False, chunk_size=JSONL_CHUNK_SIZE):
+        """
+        Lazily yields a new instance of the container class for every line of newline-delimited JSON
+        in fileobj (text or binary).
+
+        Values of known keys are stored in the instance the same way as when passed to the constructor.
+        Unknown keys raise AttributeError unless ignore_unknown=True.
+        With collect_unknown=True, yields (instance, unknown) pairs instead, unknown being a dict
+        of the keys that are not attributes.
+        """
+        import json
+
+        container_cls = self.owner if isinstance(self.owner, type) else self.owner.__class__
+        for line in iter_lines(fileobj, chunk_size=chunk_size):
+            instance = container_cls()
+            unknown = json.loads(line)
+            instance.attrs._process_(unknown, consume=True, ignore_unknown=ignore_unknown or collect_unknown)
+            if collect_unknown:
+                yield instance, unknown
+            else:
+                yield instance
+
+    def _to_dict_(self):
+        """
+        Returns values of all attributes as a dictionary, exporting nested containers as dictionaries too.
+        """
+        from .nested import to_dict
+        return to_dict(self.owner)
+
+    def _from_dict_(self, data):
+        """
+        Creates an instance of the container class from a dictionary, creating nested containers too.
+        """
+        from .nested import from_dict
+        return from_dict(self.owner if isinstance(self.owner, type) else self.owner.__class__, data)
+
+    def _deep_copy_(self):
+        """
+        Returns a copy of the instance in which nested containers are copied too.
+        """
+        from .nested import deep_copy
+        return deep_copy(self.owner)
+
+    def _validate_(self):
+        """
+        Raises ValueError listing all required attributes, in this or nested containers, which have no value.
+        """
+        from .nested import find_missing
+        missing = find_missing(self.owner)
+        if missing:
+            raise ValueError('Required attrs are missing values: {}'.format(', '.join(missing)))
+
+    def _key_(self, *names):
+        """
+        Returns a function compiled for the container class which returns the value of the named attribute
+        of an instance, or a tuple of values if more than one name is given. For use as sort key etc.
+        """
+        from .compiled import get_key
+        return get_key(self.owner if isinstance(self.owner, type) else self.owner.__class__, names)
+
+    def _group_by_(self, instances, *names):
+        """
+        Returns a dictionary of lists of instances by values (see _key_) of the named attributes.
+        """
+        from .compiled import group_by
+        return group_by(self.owner if isinstance(self.owner, type) else self.owner.__class__, instances, names)
+
+    def _filter_(self, instances, **criteria):
+        """
+        Yields instances whose attribute values equal the ones given as keyword arguments.
+        """
+        from .compiled import filter_by
+        return filter_by(self.owner if isinstance(self.owner, type) else self.owner.__class__, instances, criteria)
+
+    def _column_(self, instances, name, typecode=None):
+        """
+        Returns an array.array of values of the named attribute of instances,
+        of typecode or, if that is not given, of the fmt= option of the attribute.
+        """
+        from .compiled import column
+        return column(self.owner if isinstance(self.owner, type) else self.owner.__class__, instances, name, typecode)
+
+    def _columns_(self, instances, *names, typecodes=None):
+        """
+        Returns a dictionary of arrays (see _column_) of values of the named attributes of instances.
+        typecodes is an optional dictionary of typecodes by attribute name.
+        """
+        from .compiled import columns
+        return columns(
+            self.owner if isinstance(self.owner, type) else self.owner.__class__, instances, names, typecodes,
+        )
+
     def __contains__(self, name):
         if isinstance(self.owner, type):
             return isinstance(getattr(self.owner, name, None), Attr)
@@ -295,26 +888,28 @@ class Attrs:
             return isinstance(getattr(self.owner.__class__, name, None), Attr)
 
     def __getitem__(self, name):
-        if name not in self.bound_attrs:
+        try:
+            return self.bound_attrs[name]
+        except KeyError:
+            pass
+
+        # We are looking for attribute that is a descriptor of class Attr.
+        # This means we must NOT check instance attribute value, but instead
+        # check class attribute which will be the descriptor itself.
+        if isinstance(self.owner, type):
+            attr = getattr(self.owner, name)
+        else:
+            attr = getattr(self.owner.__class__, name)
 
-            # We are looking for attribute that is a descriptor of class Attr.
-            # This means we must NOT check instance attribute value, but instead
-            # check class attribute which will be the descriptor itself.
+        # If it's not ours then it shouldn't be accessed via attrs.
+        if not isinstance(attr, Attr):
             if isinstance(self.owner, type):
-                attr = getattr(self.owner, name)
+                raise AttributeError('{}.{} is not an Attr'.format(self.owner.__name__, name))
             else:
-                attr = getattr(self.owner.__class__, name)
-
-            # If it's not ours then it shouldn't be accessed via attrs.
-            if not isinstance(attr, Attr):
-                if isinstance(self.owner, type):
-                    raise AttributeError('{}.{} is not an Attr'.format(self.owner.__name__, name))
-                else:
-                    raise AttributeError('{}.{} is not an Attr'.format(self.owner.__class__.__name__, name))
-
-            self.bound_attrs[name] = self.owner.bound_attr_cls(self.owner, attr)
+                raise AttributeError('{}.{} is not an Attr'.format(self.owner.__class__.__name__, name))
 
-        return self.bound_attrs[name]
+        # setdefault so that threads binding the attr at the same time all get the same BoundAttr
+        return self.bound_attrs.setdefault(name, self.owner.bound_attr_cls(self.owner, attr))
 
     def __getattr__(self, name):
         return self[name]
@@ -329,34 +924,60 @@ class Attrs:
         yield from self._names_
 
 
-class ContainerMeta(type):
-    def __new__(meta, name, bases, dct):
-        base_attrs = collections.OrderedDict()
-
-        attrs_all_names = []
-
-        for base in bases[0].__mro__ if bases else ():
-            for k, v in base.__dict__.items():
-                if isinstance(v, Attr):
-                    base_attrs[k] = v
-                    if v.name is None:
-                        v.name = k
-                    if v.name not in attrs_all_names:
-                        attrs_all_names.append(v.name)
-
-        for k, v in list(dct.items()):
+def prepare_container_dict(bases, dct):
+    """
+    Prepares the namespace dct of a container class with the given bases:
+    names the Attrs declared in it, turns plain values that override inherited Attrs
+    into Attr overrides, and records the names of all Attrs of the class.
+    """
+    base_attrs = {}
+
+    attrs_all_names = []
+
+    for base in bases[0].__mro__ if bases else ():
+        if ATTRS_ALL_NAMES in base.__dict__:
+            # A container class already knows all its Attrs, including inherited ones.
+            for k in base.__dict__[ATTRS_ALL_NAMES]:
+                base_attrs.setdefault(k, getattr(base, k))
+                if k not in attrs_all_names:
+                    attrs_all_names.append(k)
+            break
+        for k, v in base.__dict__.items():
             if isinstance(v, Attr):
+                # The nearest definition is the one to inherit from
+                base_attrs.setdefault(k, v)
                 if v.name is None:
                     v.name = k
                 if v.name not in attrs_all_names:
                     attrs_all_names.append(v.name)
-            elif k in base_attrs:
-                dct[k] = copy(base_attrs[k])
-                dct[k].default = v
 
-        dct[ATTRS_ALL_NAMES] = attrs_all_names
+    for k, v in list(dct.items()):
+        if isinstance(v, Attr):
+            if v.name is None:
+                v.name = k
+            if v.name not in attrs_all_names:
+                attrs_all_names.append(v.name)
+        elif k in base_attrs:
+            # A plain value is the default of the subclass, replacing any default_factory too
+            dct[k] = base_attrs[k]._override_(default=v, default_factory=None)
+
+    dct[ATTRS_ALL_NAMES] = attrs_all_names
+
+    nested = {}
+    for k in attrs_all_names:
+        attr = dct[k] if isinstance(dct.get(k), Attr) else base_attrs.get(k)
+        for kind in NESTED_KINDS:
+            if attr is not None and kind in attr.options:
+                nested[k] = kind
+    dct[ATTRS_NESTED] = nested
+
+
+class ContainerMeta(type):
+    def __new__(meta, name, bases, dct):
+        prepare_container_dict(bases, dct)
 
         container_cls = super().__new__(meta, name, bases, dct)
+        setattr(container_cls, ATTRS_FOR_CONTAINER_CLS, container_cls.attrs_cls(container_cls))
 
         return container_cls
 
@@ -367,13 +988,16 @@ class _AttrsProperty:
             # Must check against __dict__ because the attribute may have been set
             # against parent class and we would fail to initialise the class-specific
             # attribute list.
+            # Container classes get theirs when created, this is for classes created by other means.
             if ATTRS_FOR_CONTAINER_CLS not in owner.__dict__:
                 setattr(owner, ATTRS_FOR_CONTAINER_CLS, owner.attrs_cls(owner))
-            return getattr(owner, ATTRS_FOR_CONTAINER_CLS)
+            return owner.__dict__[ATTRS_FOR_CONTAINER_CLS]
         else:
-            if not hasattr(instance, ATTRS_FOR_CONTAINER_INSTANCE):
-                setattr(instance, ATTRS_FOR_CONTAINER_INSTANCE, instance.attrs_cls(instance))
-            return getattr(instance, ATTRS_FOR_CONTAINER_INSTANCE)
+            try:
+                return instance.__dict__[ATTRS_FOR_CONTAINER_INSTANCE]
+            except KeyError:
+                # setdefault so that threads accessing attrs at the same time all get the same Attrs
+                return instance.__dict__.setdefault(ATTRS_FOR_CONTAINER_INSTANCE, instance.attrs_cls(instance))
 
     def __set__(self, instance, value):
         raise AttributeError('{}.attrs is read-only'.format(instance.__class__.__name__))
@@ -383,14 +1007,99 @@ class ContainerBase(metaclass=ContainerMeta):
     attrs_cls = Attrs
     bound_attr_cls = BoundAttr
 
+    # Maximum number of released instances kept for reuse by attrs._acquire_()
+    attrs_pool_size = 64
+
+    # Set to a WeakSet by the first ContainerIndex of the class, see wr_attrs.index
+    _attrs_indexes_ = None
+
     attrs = _AttrsProperty()
 
     def __init__(self, *args, **kwargs):
-        for k in list(kwargs.keys()):
-            if k in self.attrs:
-                self.attrs[k].value = kwargs.pop(k)
+        if kwargs:
+            self.attrs._process_(kwargs, consume=True, ignore_unknown=True)
         super().__init__(*args, **kwargs)
 
+    def __copy__(self):
+        instance = self.__class__.__new__(self.__class__)
+        instance.__dict__.update(self.__dict__)
+        instance.__dict__.pop(ATTRS_FOR_CONTAINER_INSTANCE, None)
+        return instance
+
+    def __reduce__(self):
+        from .codec import get_codec
+        return get_codec(self.__class__).reduce(self)
+
+    def __setstate__(self, state):
+        from .codec import get_codec
+        get_codec(self.__class__).setstate(self, state)
+
+
+def _prepare_container_cls(container_cls):
+    dct = dict(container_cls.__dict__)
+    prepare_container_dict(container_cls.__bases__, dct)
+    for k, v in dct.items():
+        if k not in container_cls.__dict__ or container_cls.__dict__[k] is not v:
+            setattr(container_cls, k, v)
+
+
+def _make_container_in_place(container_cls):
+    if hasattr(container_cls, ATTRS_ALL_NAMES):
+        raise TypeError('{} is already a container class'.format(container_cls.__name__))
+    if '__init_subclass__' in container_cls.__dict__:
+        raise TypeError('{} must not define __init_subclass__ to be made a container in place'.format(
+            container_cls.__name__,
+        ))
+
+    _prepare_container_cls(container_cls)
+
+    for k in (
+        'attrs_cls', 'bound_attr_cls', 'attrs_pool_size', ATTRS_INDEXES,
+        'attrs', '__copy__', '__reduce__', '__setstate__',
+    ):
+        if k not in container_cls.__dict__:
+            setattr(container_cls, k, ContainerBase.__dict__[k])
+
+    init = container_cls.__init__
 
-def container(container_cls):
-    return type(container_cls.__name__, (container_cls, ContainerBase), {})
+    def __init__(self, *args, **kwargs):
+        if kwargs:
+            self.attrs._process_(kwargs, consume=True, ignore_unknown=True)
+        init(self, *args, **kwargs)
+
+    __init__.__qualname__ = '{}.__init__'.format(container_cls.__qualname__)
+    __init__.__doc__ = init.__doc__
+    container_cls.__init__ = __init__
+
+    def __init_subclass__(cls, **kwargs):
+        super(container_cls, cls).__init_subclass__(**kwargs)
+        _prepare_container_cls(cls)
+        setattr(cls, ATTRS_FOR_CONTAINER_CLS, cls.attrs_cls(cls))
+
+    container_cls.__init_subclass__ = classmethod(__init_subclass__)
+
+    setattr(container_cls, ATTRS_FOR_CONTAINER_CLS, container_cls.attrs_cls(container_cls))
+
+    return container_cls
+
+
+def container(container_cls=None, inplace=False):
+    """
+    Class decorator that makes a container class out of container_cls.
+
+    By default, returns a new class with the same name deriving from container_cls and ContainerBase.
+
+    With ``@container(inplace=True)``, container_cls itself is made a container class,
+    without a wrapper class and without ContainerMeta. ContainerBase members are installed
+    on the class, and its subclasses are set up by ``__init_subclass__`` (Python 3.6+).
+    Attribute values passed to the constructor are set before the class's own
+    ``__init__`` is called with the remaining arguments.
+    """
+    if container_cls is None:
+        return lambda cls: container(cls, inplace=inplace)
+    if inplace:
+        return _make_container_in_place(container_cls)
+    return type(container_cls.__name__, (container_cls, ContainerBase), {
+        '__module__': container_cls.__module__,
+        '__qualname__': container_cls.__qualname__,
+    })
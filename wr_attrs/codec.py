@@ -0,0 +1,277 @@
+"""
+Compact binary encoding of container instances.
+
+A codec is generated once per container class from its attribute names
+and encodes only the stored values, positionally::
+
+    fingerprint | presence mask | overflow mask | fixed-width block | pickled tuple of remaining values
+
+Attributes declared with a ``fmt`` option holding a :mod:`struct` format of a single value
+(``Attr(fmt='d')``, ``Attr(fmt='q')``, ``Attr(fmt='16s')``) go into the fixed-width
+block and can be decoded straight from a buffer with :meth:`Codec.fixed_values`.
+Values of such attributes which the format can not represent exactly (None, a string
+in a ``'d'`` attribute, ...) are flagged in the overflow mask and pickled with the remaining values.
+Any other ``fmt`` (``'str'``, ``'bytes'``, or an option meaning something else entirely) is ignored.
+
+Unset attributes stay unset after decoding. Hooks are not invoked either way:
+the codec works on the values the instance has stored.
+
+Pickling (and deep copying) of container instances does not use this encoding: it passes
+stored values positionally as the state of an instance created empty (see :meth:`Codec.reduce`),
+so that they go through pickle's memo together with everything else.
+"""
+import copyreg
+import pickle
+import struct
+import zlib
+
+from .attrs3 import ATTRS_ALL_NAMES, ATTRS_FOR_CONTAINER_INSTANCE, ATTRS_MISSING, get_class_cache, get_storage_name
+
+CODEC = 'codec'
+
+_uint32 = struct.Struct('<I')
+
+_missing = object()
+
+VARIABLE_FORMATS = ('str', 'bytes')
+
+
+def get_fixed_struct(fmt):
+    """
+    Returns a little-endian struct of fmt if fmt is a struct format of a single value, otherwise None.
+    """
+    if not fmt or not isinstance(fmt, str) or fmt in VARIABLE_FORMATS:
+        return None
+    try:
+        fixed_struct = struct.Struct('<' + fmt)
+    except struct.error:
+        return None
+    if len(fixed_struct.unpack(bytes(fixed_struct.size))) != 1:
+        return None
+    return fixed_struct
+
+
+class Codec:
+    def __init__(self, container_cls):
+        self.container_cls = container_cls
+        self.names = tuple(getattr(container_cls, ATTRS_ALL_NAMES))
+        self.storage_names = tuple(get_storage_name(container_cls, name) for name in self.names)
+        self._storage_names_set = frozenset(self.storage_names)
+        self.interns = tuple(getattr(container_cls, name).intern for name in self.names)
+
+        fmts = [getattr(container_cls, name).options.get('fmt') for name in self.names]
+        field_structs = [get_fixed_struct(fmt) for fmt in fmts]
+        self.fixed_indexes = tuple(i for i, field_struct in enumerate(field_structs) if field_struct)
+        self.other_indexes = tuple(i for i, field_struct in enumerate(field_structs) if not field_struct)
+        self.field_structs = tuple(field_structs[i] for i in self.fixed_indexes)
+        self.fixed_struct = struct.Struct('<' + ''.join(fmts[i] for i in self.fixed_indexes))
+        self.fixed_placeholders = tuple(
+            field_struct.unpack(bytes(field_struct.size))[0] for field_struct in self.field_structs
+        )
+
+        self.mask_size = (len(self.names) + 7) // 8
+        self.fixed_offset = _uint32.size + 2 * self.mask_size
+        self.other_offset = self.fixed_offset + self.fixed_struct.size
+
+        schema = '{}.{}({})'.format(
+            container_cls.__module__, container_cls.__qualname__,
+            ','.join('{}:{}'.format(name, fmt if field_struct else '') for name, fmt, field_struct in zip(
+                self.names, fmts, field_structs,
+            )),
+        )
+        self.fingerprint = zlib.crc32(schema.encode('utf-8'))
+        self._header = _uint32.pack(self.fingerprint)
+
+    def __repr__(self):
+        return '<{} {}>'.format(self.__class__.__name__, self.container_cls.__name__)
+
+    def dumps(self, instance):
+        storage = instance.__dict__
+        values = [storage.get(storage_name, _missing) for storage_name in self.storage_names]
+
+        present = 0
+        for i, value in enumerate(values):
+            if value is not _missing:
+                present |= 1 << i
+
+        fixed, overflow = self._pack_fixed(values)
+
+        others = [None if values[i] is _missing else values[i] for i in self.other_indexes]
+        others.extend(values[i] for i in self.fixed_indexes if overflow >> i & 1)
+
+        return b''.join((
+            self._header,
+            present.to_bytes(self.mask_size, 'little'),
+            overflow.to_bytes(self.mask_size, 'little'),
+            fixed,
+            pickle.dumps(tuple(others), protocol=pickle.HIGHEST_PROTOCOL),
+        ))
+
+    def loads(self, data):
+        buffer = memoryview(data)
+        self.check_fingerprint(buffer)
+
+        present, overflow = self._masks(buffer)
+        values = [None] * len(self.names)
+        for i, value in zip(self.fixed_indexes, self.fixed_struct.unpack_from(buffer, self.fixed_offset)):
+            values[i] = value
+        others = pickle.loads(buffer[self.other_offset:])
+        for i, value in zip(self.other_indexes + self._overflow_indexes(overflow), others):
+            values[i] = value
+
+        instance = self.container_cls.__new__(self.container_cls)
+        storage = instance.__dict__
+        for i, storage_name in enumerate(self.storage_names):
+            if present >> i & 1:
+                if self.interns[i] is None:
+                    storage[storage_name] = values[i]
+                else:
+                    storage[storage_name] = self.interns[i](values[i])
+        return instance
+
+    def dump(self, instances, fileobj):
+        """
+        Writes length-prefixed records of instances to a binary file object.
+        """
+        for instance in instances:
+            data = self.dumps(instance)
+            fileobj.write(_uint32.pack(len(data)))
+            fileobj.write(data)
+
+    def load(self, fileobj):
+        """
+        Lazily yields instances from records written by :meth:`dump`.
+        """
+        while True:
+            prefix = fileobj.read(_uint32.size)
+            if not prefix:
+                return
+            if len(prefix) < _uint32.size:
+                raise ValueError('Truncated record length')
+            size, = _uint32.unpack(prefix)
+            data = fileobj.read(size)
+            if len(data) < size:
+                raise ValueError('Truncated record')
+            yield self.loads(data)
+
+    def fixed_values(self, data, offset=0):
+        """
+        Decodes only the fixed-width attributes of the record starting at offset in data
+        (anything supporting the buffer protocol) without copying the record.
+        Unset attributes are reported as None.
+        Only records holding values that did not fit their format need unpickling.
+        """
+        buffer = memoryview(data)
+        self.check_fingerprint(buffer, offset)
+        present, overflow = self._masks(buffer, offset)
+        values = dict(zip(self.fixed_indexes, self.fixed_struct.unpack_from(buffer, offset + self.fixed_offset)))
+        if overflow:
+            others = pickle.loads(buffer[offset + self.other_offset:])
+            values.update(zip(self._overflow_indexes(overflow), others[len(self.other_indexes):]))
+        return {
+            self.names[i]: value if present >> i & 1 else None
+            for i, value in values.items()
+        }
+
+    def _masks(self, buffer, offset=0):
+        """
+        Returns presence and overflow masks of the record starting at offset in buffer.
+        """
+        start = offset + _uint32.size
+        return (
+            int.from_bytes(buffer[start:start + self.mask_size], 'little'),
+            int.from_bytes(buffer[start + self.mask_size:start + 2 * self.mask_size], 'little'),
+        )
+
+    def _overflow_indexes(self, overflow):
+        if not overflow:
+            return ()
+        return tuple(i for i in self.fixed_indexes if overflow >> i & 1)
+
+    def check_fingerprint(self, buffer, offset=0):
+        fingerprint, = _uint32.unpack_from(buffer, offset)
+        if fingerprint != self.fingerprint:
+            raise ValueError('Record was not encoded with the schema of {}'.format(self.container_cls.__name__))
+
+    def reduce(self, instance):
+        """
+        Implements ``__reduce__`` for instances of the container class.
+
+        The state is ``(presence mask, values of present attributes, other contents of __dict__ or None)``.
+        Values are pickled by the same pickler as the instance, so instances referencing themselves
+        and values shared with other objects are restored as such.
+        """
+        storage = instance.__dict__
+        present = 0
+        values = []
+        for i, storage_name in enumerate(self.storage_names):
+            if storage_name in storage:
+                present |= 1 << i
+                values.append(storage[storage_name])
+        extra = {
+            k: v for k, v in storage.items()
+            if k not in (ATTRS_FOR_CONTAINER_INSTANCE, ATTRS_MISSING) and k not in self._storage_names_set
+        }
+        return copyreg.__newobj__, (self.container_cls,), (present, tuple(values), extra or None)
+
+    def setstate(self, instance, state):
+        """
+        Implements ``__setstate__`` for instances of the container class, see :meth:`reduce`.
+        """
+        present, values, extra = state
+        storage = instance.__dict__
+        values = iter(values)
+        for i, storage_name in enumerate(self.storage_names):
+            if present >> i & 1:
+                if self.interns[i] is None:
+                    storage[storage_name] = next(values)
+                else:
+                    storage[storage_name] = self.interns[i](next(values))
+        if extra:
+            storage.update(extra)
+
+    def _pack_fixed(self, values):
+        """
+        Returns the fixed-width block of values and the mask of fixed-width attributes
+        whose values are not represented in it and must be pickled instead.
+        """
+        overflow = 0
+        fixed = []
+        for i, placeholder in zip(self.fixed_indexes, self.fixed_placeholders):
+            value = values[i]
+            if value is _missing or value is None:
+                if value is None:
+                    overflow |= 1 << i
+                fixed.append(placeholder)
+            else:
+                fixed.append(value)
+
+        try:
+            data = self.fixed_struct.pack(*fixed)
+        except (struct.error, OverflowError):
+            for pos, field_struct in enumerate(self.field_structs):
+                try:
+                    field_struct.pack(fixed[pos])
+                except (struct.error, OverflowError):
+                    overflow |= 1 << self.fixed_indexes[pos]
+                    fixed[pos] = self.fixed_placeholders[pos]
+            data = self.fixed_struct.pack(*fixed)
+
+        # Values that pack but do not come back the same (an int in 'd', short bytes in '4s', NaN) are pickled too.
+        for i, value, packed in zip(self.fixed_indexes, fixed, self.fixed_struct.unpack(data)):
+            if overflow >> i & 1 or values[i] is _missing:
+                continue
+            if type(packed) is not type(value) or packed != value:
+                overflow |= 1 << i
+
+        return data, overflow
+
+
+def get_codec(container_cls):
+    """
+    Returns the codec of container_cls, creating it on first use.
+    """
+    cache = get_class_cache(container_cls)
+    if CODEC not in cache:
+        cache[CODEC] = Codec(container_cls)
+    return cache[CODEC]
@@ -0,0 +1,148 @@
+"""
+Functions generated per container class that read attribute values of many instances fast.
+
+Attributes without hooks, factories or required= are read straight from instance storage
+(falling back to the class-level default). All other attributes are read as attributes,
+so get_value hooks and required checks apply. Instances of other classes than the one
+the function was compiled for are read as attributes.
+
+Compiled functions reflect the hooks the attributes had when the function was compiled.
+"""
+from array import array
+from operator import attrgetter
+
+from .attrs3 import get_class_cache, get_storage_name
+
+KEYS = 'keys'
+COLUMNS = 'columns'
+
+# struct formats which are also array typecodes
+ARRAY_TYPECODES = 'bBhHiIlLqQfd'
+
+
+def is_plain(attr):
+    """
+    Returns True if value of attr can be read from storage without invoking Attr.__get__.
+    """
+    if attr._f_get_value is not None or attr._f_init_value is not None:
+        return False
+    return attr.default_factory is None and not attr.required
+
+
+def _value_expr(container_cls, name, i, namespace, storage='storage'):
+    """
+    Returns source of an expression reading the value of attribute name of an instance obj
+    of container_cls, whose __dict__ is storage, adding the objects it refers to to namespace.
+    """
+    attr = container_cls.attrs[name].attr
+    if is_plain(attr):
+        namespace['record{}'.format(i)] = attr._record_
+        return '{}.get({!r}, record{}.default)'.format(storage, get_storage_name(container_cls, name), i)
+    return 'getattr(obj, {!r})'.format(name)
+
+
+def compile_key(container_cls, names):
+    """
+    Returns a function of an instance of container_cls which returns the value of
+    the single attribute in names, or a tuple of values if there are several.
+    """
+    namespace = {'cls': container_cls, 'fallback': attrgetter(*names)}
+    exprs = [_value_expr(container_cls, name, i, namespace) for i, name in enumerate(names)]
+
+    source = '\n'.join((
+        'def key(obj):',
+        '    if obj.__class__ is not cls:',
+        '        return fallback(obj)',
+        '    storage = obj.__dict__',
+        '    return {}'.format(exprs[0] if len(exprs) == 1 else '({},)'.format(', '.join(exprs))),
+    ))
+    exec(compile(source, '<{}.attrs._key_{!r}>'.format(container_cls.__name__, tuple(names)), 'exec'), namespace)
+    return namespace['key']
+
+
+def get_key(container_cls, names):
+    """
+    Returns the compiled key function of names of container_cls, compiling it on first use.
+    """
+    names = tuple(names)
+    if not names:
+        raise TypeError('At least one attribute name is required')
+    cache = get_class_cache(container_cls).setdefault(KEYS, {})
+    if names not in cache:
+        cache[names] = compile_key(container_cls, names)
+    return cache[names]
+
+
+def group_by(container_cls, instances, names):
+    groups = {}
+    key = get_key(container_cls, names)
+    for instance in instances:
+        k = key(instance)
+        if k in groups:
+            groups[k].append(instance)
+        else:
+            groups[k] = [instance]
+    return groups
+
+
+def filter_by(container_cls, instances, criteria):
+    names = tuple(criteria)
+    key = get_key(container_cls, names)
+    expected = criteria[names[0]] if len(names) == 1 else tuple(criteria[name] for name in names)
+    return (instance for instance in instances if key(instance) == expected)
+
+
+def get_typecode(container_cls, name):
+    """
+    Returns the array typecode of attribute name of container_cls, taken from its fmt= option.
+    """
+    fmt = container_cls.attrs[name].options.get('fmt')
+    if not isinstance(fmt, str) or len(fmt) != 1 or fmt not in ARRAY_TYPECODES:
+        raise TypeError('{}.{} must declare a numeric fmt= option, or typecode= must be given, not {!r}'.format(
+            container_cls.__name__, name, fmt,
+        ))
+    return fmt
+
+
+def compile_column(container_cls, name):
+    """
+    Returns a function of an iterable of instances of container_cls and a typecode
+    which returns an array of values of attribute name of the instances.
+    """
+    namespace = {'cls': container_cls, 'fallback': attrgetter(name), 'array': array}
+    # Values are appended to the array as they are read, without an intermediate list
+    source = '\n'.join((
+        'def column(instances, typecode):',
+        '    values = array(typecode)',
+        '    append = values.append',
+        '    for obj in instances:',
+        '        if obj.__class__ is cls:',
+        '            append({})'.format(_value_expr(container_cls, name, 0, namespace, storage='obj.__dict__')),
+        '        else:',
+        '            append(fallback(obj))',
+        '    return values',
+    ))
+    exec(compile(source, '<{}.attrs._column_({!r})>'.format(container_cls.__name__, name), 'exec'), namespace)
+    return namespace['column']
+
+
+def column(container_cls, instances, name, typecode=None):
+    """
+    Returns an array of values of attribute name of instances.
+    """
+    if typecode is None:
+        typecode = get_typecode(container_cls, name)
+    cache = get_class_cache(container_cls).setdefault(COLUMNS, {})
+    if name not in cache:
+        cache[name] = compile_column(container_cls, name)
+    return cache[name](instances, typecode)
+
+
+def columns(container_cls, instances, names, typecodes=None):
+    """
+    Returns a dictionary of arrays of values of the named attributes of instances.
+    """
+    typecodes = typecodes or {}
+    if not isinstance(instances, (list, tuple)):
+        instances = list(instances)
+    return {name: column(container_cls, instances, name, typecodes.get(name)) for name in names}
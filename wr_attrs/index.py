@@ -0,0 +1,205 @@
+"""
+Indexes of collections of container instances by attribute values.
+
+An index holds instances of a container class (and its subclasses) and looks them up
+by the values of the attributes it is on::
+
+    users = ContainerIndex(User, on=('email',), unique=True)
+    users.add(user)
+    users.get('alice@example.com')
+
+    by_age = ContainerIndex(User, on=('age',), sorted=True)
+    by_age.range(18, 65)
+
+Lookups by value are O(1); with ``sorted=True``, range lookups are O(log n) plus the size of the result.
+Instances whose key is None (or, for several attributes, contains None) are found by value
+but left out of the sorted order, so optional attributes can be indexed.
+
+While a class has live indexes, writes to attributes of its instances (``instance.x = ...``,
+``attrs.set``, ``attrs._reset_`` etc.) update the indexes that hold the instance.
+Values written straight to instance storage, bypassing ``BoundAttr.value``, are not seen.
+"""
+import weakref
+from bisect import bisect_left, bisect_right
+
+from .attrs3 import ATTRS_INDEXES
+from .compiled import get_key
+
+
+class ContainerIndex:
+    """
+    Collection of instances of container_cls indexed by the values of attributes named in ``on``.
+
+    With unique=True, adding an instance or writing a value that would give two instances
+    of the index the same key raises ValueError and leaves the index and the instance unchanged.
+    With sorted=True, the index also supports :meth:`range`; keys other than None must then be comparable.
+    Keys are validated before anything is changed: a key which can not be hashed (or ordered, in a sorted index)
+    raises TypeError, leaving the index and the instance unchanged.
+    """
+
+    def __init__(self, container_cls, on, unique=False, sorted=False, instances=()):
+        if isinstance(on, str):
+            on = (on,)
+        self.container_cls = container_cls
+        self.on = tuple(on)
+        self.unique = unique
+        self.sorted = sorted
+
+        for name in self.on:
+            if name not in container_cls.attrs:
+                raise AttributeError(name)
+
+        self._key = get_key(container_cls, self.on)
+        self._members = {}  # id(instance) -> instance
+        self._keys = {}  # id(instance) -> key
+        self._buckets = {}  # key -> {id(instance): instance}
+        self._sorted_keys = []
+        self._sorted_ids = []
+
+        if container_cls.__dict__.get(ATTRS_INDEXES) is None:
+            setattr(container_cls, ATTRS_INDEXES, weakref.WeakSet())
+        container_cls.__dict__[ATTRS_INDEXES].add(self)
+
+        for instance in instances:
+            self.add(instance)
+
+    def __repr__(self):
+        return '<{} {} on {}{}>'.format(
+            self.__class__.__name__, self.container_cls.__name__,
+            ', '.join(self.on), ' unique' if self.unique else '',
+        )
+
+    def __len__(self):
+        return len(self._members)
+
+    def __iter__(self):
+        return iter(list(self._members.values()))
+
+    def __contains__(self, instance):
+        return id(instance) in self._members
+
+    def _make_key(self, values):
+        return values[0] if len(self.on) == 1 else tuple(values)
+
+    def add(self, instance):
+        if not isinstance(instance, self.container_cls):
+            raise TypeError('{!r} is not an instance of {}'.format(instance, self.container_cls.__name__))
+        if id(instance) in self._members:
+            return
+        key = self._key(instance)
+        self._validate(instance, key)
+        self._members[id(instance)] = instance
+        self._insert(instance, key)
+
+    def update(self, instances):
+        for instance in instances:
+            self.add(instance)
+
+    def discard(self, instance):
+        if id(instance) not in self._members:
+            return
+        self._remove(instance)
+        del self._members[id(instance)]
+
+    def remove(self, instance):
+        if id(instance) not in self._members:
+            raise KeyError(instance)
+        self.discard(instance)
+
+    def clear(self):
+        self._members.clear()
+        self._keys.clear()
+        self._buckets.clear()
+        self._sorted_keys.clear()
+        self._sorted_ids.clear()
+
+    def get(self, *values):
+        """
+        Returns an instance with attribute values equal to values (in the order of ``on``), or None.
+        """
+        bucket = self._buckets.get(self._make_key(values))
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+    def find(self, *values):
+        """
+        Returns a list of all instances with attribute values equal to values (in the order of ``on``).
+        """
+        return list(self._buckets.get(self._make_key(values), {}).values())
+
+    def range(self, lo=None, hi=None):
+        """
+        Returns a list of instances with keys from lo to hi (both inclusive, None meaning unbounded),
+        ordered by key. Instances with None keys are not included. Available only on sorted indexes.
+        """
+        if not self.sorted:
+            raise TypeError('{!r} is not sorted'.format(self))
+        start = 0 if lo is None else bisect_left(self._sorted_keys, lo)
+        stop = len(self._sorted_keys) if hi is None else bisect_right(self._sorted_keys, hi)
+        return [self._members[i] for i in self._sorted_ids[start:stop]]
+
+    def covers(self, instance, name):
+        """
+        Returns True if a write of attribute name of instance may change its key in this index.
+        """
+        return name in self.on and id(instance) in self._members
+
+    def check(self, instance, name, value):
+        """
+        Raises if writing value to attribute name of instance would give it a key this index can not hold
+        (see :meth:`_validate`). Called before the value is stored, so that a failed write changes nothing.
+        """
+        self._validate(instance, self._make_key([value if n == name else getattr(instance, n) for n in self.on]))
+
+    def _validate(self, instance, key):
+        """
+        Raises TypeError if key can not be hashed or, in a sorted index, ordered among the other keys,
+        and ValueError if it would break uniqueness of the index.
+        """
+        bucket = self._buckets.get(key)
+        if self.unique and bucket and id(instance) not in bucket:
+            raise ValueError('{!r} is already in {!r}'.format(key, self))
+        if self.sorted and self._is_ordered(key):
+            bisect_right(self._sorted_keys, key)
+
+    def _is_ordered(self, key):
+        """
+        Returns True if key belongs to the sorted order, i.e. it is not None and does not contain None.
+        """
+        if len(self.on) == 1:
+            return key is not None
+        return all(value is not None for value in key)
+
+    def reindex(self, instance):
+        """
+        Moves instance to its current key, after its attribute values have changed.
+        """
+        if id(instance) not in self._members:
+            return
+        key = self._key(instance)
+        if key == self._keys[id(instance)]:
+            return
+        self._remove(instance)
+        self._insert(instance, key)
+
+    def _insert(self, instance, key):
+        self._keys[id(instance)] = key
+        self._buckets.setdefault(key, {})[id(instance)] = instance
+        if self.sorted and self._is_ordered(key):
+            i = bisect_right(self._sorted_keys, key)
+            self._sorted_keys.insert(i, key)
+            self._sorted_ids.insert(i, id(instance))
+
+    def _remove(self, instance):
+        key = self._keys.pop(id(instance))
+        bucket = self._buckets[key]
+        del bucket[id(instance)]
+        if not bucket:
+            del self._buckets[key]
+        if self.sorted and self._is_ordered(key):
+            i = bisect_left(self._sorted_keys, key)
+            while self._sorted_ids[i] != id(instance):
+                i += 1
+            del self._sorted_keys[i]
+            del self._sorted_ids[i]
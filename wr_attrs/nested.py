@@ -0,0 +1,164 @@
+"""
+Deep operations on containers holding other containers.
+
+Nested containers are declared with ``Attr(container=SubCls)`` for a single
+instance and ``Attr(list_of=SubCls)`` for a list of instances. To reference a class
+that does not exist yet, declare the option as None and set it later::
+
+    @container
+    class Node:
+        children = Attr(list_of=None)
+
+    Node.attrs.children.list_of = Node
+
+All operations walk the tree with an explicit stack, so their depth is not
+limited by the recursion limit. An instance (or dictionary) that appears several
+times in a tree is processed once and the result is shared in the same way.
+"""
+from copy import copy
+
+from .attrs3 import ATTRS_ALL_NAMES, ATTRS_NESTED, Required, get_storage_name
+
+
+def get_nested(container_cls):
+    """
+    Returns ``{name: (kind, cls)}`` of attributes of container_cls declared
+    with ``container=`` or ``list_of=``.
+    """
+    return {
+        name: (kind, getattr(container_cls, name).options[kind])
+        for name, kind in getattr(container_cls, ATTRS_NESTED, {}).items()
+        if getattr(container_cls, name).options[kind] is not None
+    }
+
+
+class _NestedCache(dict):
+    def __missing__(self, container_cls):
+        self[container_cls] = nested = get_nested(container_cls)
+        return nested
+
+
+def _map_nested(kind, value, func):
+    if value is None:
+        return None
+    if kind == 'list_of':
+        return [func(item) for item in value]
+    return func(value)
+
+
+def to_dict(instance):
+    """
+    Returns attribute values of instance as a dictionary, exporting nested containers as dictionaries.
+    Values are read as attributes, so get_value hooks apply.
+    """
+    exported = {}
+    stack = []
+    nested_of = _NestedCache()
+
+    def export(obj):
+        if obj is None:
+            return None
+        if id(obj) not in exported:
+            exported[id(obj)] = (obj, {})
+            stack.append(obj)
+        return exported[id(obj)][1]
+
+    root = export(instance)
+    while stack:
+        obj = stack.pop()
+        out = exported[id(obj)][1]
+        nested = nested_of[obj.__class__]
+        for name in getattr(obj.__class__, ATTRS_ALL_NAMES):
+            value = getattr(obj, name)
+            if name in nested:
+                value = _map_nested(nested[name][0], value, export)
+            out[name] = value
+    return root
+
+
+def from_dict(container_cls, data):
+    """
+    Creates an instance of container_cls from a dictionary the same way as ``container_cls(**data)``,
+    creating nested containers from nested dictionaries.
+    Values that already are container instances are used as they are.
+    """
+    created = {}
+    stack = []
+    nested_of = _NestedCache()
+
+    def create(cls):
+        def create_instance(value):
+            if not isinstance(value, dict):
+                return value
+            if id(value) not in created:
+                nested = nested_of[cls]
+                instance = cls(**{k: v for k, v in value.items() if k not in nested})
+                created[id(value)] = (value, instance)
+                stack.append((instance, value, nested))
+            return created[id(value)][1]
+        return create_instance
+
+    root = create(container_cls)(data)
+    while stack:
+        instance, value, nested = stack.pop()
+        for name, (kind, cls) in nested.items():
+            if name in value:
+                instance.attrs[name].value = _map_nested(kind, value[name], create(cls))
+    return root
+
+
+def deep_copy(instance):
+    """
+    Returns a copy of instance in which nested containers are copied too.
+    Stored values are copied without invoking hooks; values other than nested containers are shared.
+    """
+    copies = {}
+    stack = []
+    nested_of = _NestedCache()
+
+    def copy_instance(obj):
+        if obj is None:
+            return None
+        if id(obj) not in copies:
+            copies[id(obj)] = (obj, copy(obj))
+            stack.append(obj)
+        return copies[id(obj)][1]
+
+    root = copy_instance(instance)
+    while stack:
+        obj = stack.pop()
+        storage = copies[id(obj)][1].__dict__
+        for name, (kind, _) in nested_of[obj.__class__].items():
+            storage_name = get_storage_name(obj.__class__, name)
+            if storage_name in storage:
+                storage[storage_name] = _map_nested(kind, storage[storage_name], copy_instance)
+    return root
+
+
+def find_missing(instance):
+    """
+    Returns paths (like ``'items[2].name'``) of all required attributes
+    of instance and its nested containers which have no value.
+    """
+    missing = []
+    seen = set()
+    nested_of = _NestedCache()
+    stack = [(instance, '')]
+    while stack:
+        obj, path = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        missing.extend(path + name for name in obj.attrs._missing_())
+
+        children = []
+        for name, (kind, _) in nested_of[obj.__class__].items():
+            value = obj.attrs[name].value
+            if value is not None and value is not Required:
+                if kind == 'list_of':
+                    children.extend((v, '{}{}[{}].'.format(path, name, i)) for i, v in enumerate(value))
+                else:
+                    children.append((value, '{}{}.'.format(path, name)))
+        stack.extend(reversed(children))
+    return missing
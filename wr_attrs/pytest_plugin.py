@@ -0,0 +1,111 @@
+"""
+pytest plugin with a ``budget`` fixture asserting upper bounds on the cost of an operation.
+
+Enable it in a ``conftest.py``::
+
+    pytest_plugins = ['wr_attrs.pytest_plugin']
+
+and declare budgets in tests::
+
+    def test_plain_read_budget(budget):
+        c = C(x=1)
+        budget(lambda: c.x, calls=4, blocks=0)
+
+``calls`` is the number of Python function calls made by the operation (reported by
+:func:`sys.setprofile`, not counting the operation itself nor functions implemented in C).
+``blocks`` is the number of memory blocks allocated by the operation and still
+allocated after it has returned, including its return value but not garbage collected
+reference cycles (reported by :mod:`tracemalloc`).
+The operation is run ``warmup`` times before it is measured, so that one-off work
+such as filling caches does not count.
+"""
+import gc
+import sys
+import tracemalloc
+
+import pytest
+
+
+def count_calls(func):
+    """
+    Returns the number of Python function calls made by func().
+    """
+    calls = [0]
+
+    def profile(frame, event, arg):
+        if event == 'call':
+            calls[0] += 1
+
+    # Any profiler already active (coverage tools, debuggers) is suspended while counting
+    previous = sys.getprofile()
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(previous)
+
+    # The call of func itself
+    return calls[0] - 1
+
+
+def count_blocks(func):
+    """
+    Returns the number of memory blocks allocated by func() and still allocated after it has returned
+    and garbage has been collected.
+    """
+    ignored = {tracemalloc.__file__, __file__}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        # Once more while tracing, so that one-off allocations of tracemalloc itself
+        # (and of caches it fills, such as ABC subclass checks) are not counted
+        func()
+        tracemalloc.take_snapshot().compare_to(tracemalloc.take_snapshot(), 'filename')
+
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        result = func()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        del result
+    finally:
+        if started:
+            tracemalloc.stop()
+    return sum(
+        stat.count_diff for stat in after.compare_to(before, 'filename')
+        if stat.traceback[0].filename not in ignored
+    )
+
+
+def measure(func, warmup=2):
+    """
+    Returns ``(calls, blocks)`` of func(), measured after calling it warmup times.
+    """
+    for _ in range(warmup):
+        func()
+    return count_calls(func), count_blocks(func)
+
+
+def check_budget(func, calls=None, blocks=None, warmup=2):
+    """
+    Raises AssertionError if func() makes more than calls Python function calls
+    or leaves more than blocks memory blocks allocated. Returns ``(calls, blocks)`` measured.
+    """
+    measured_calls, measured_blocks = measure(func, warmup=warmup)
+    exceeded = []
+    if calls is not None and measured_calls > calls:
+        exceeded.append('{} calls (budget {})'.format(measured_calls, calls))
+    if blocks is not None and measured_blocks > blocks:
+        exceeded.append('{} allocated blocks (budget {})'.format(measured_blocks, blocks))
+    if exceeded:
+        raise AssertionError('{!r} exceeded budget: {}'.format(func, ', '.join(exceeded)))
+    return measured_calls, measured_blocks
+
+
+@pytest.fixture
+def budget():
+    """
+    Returns :func:`check_budget`.
+    """
+    return check_budget
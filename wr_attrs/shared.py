@@ -0,0 +1,209 @@
+"""
+Instances of a numeric container class laid out in :mod:`multiprocessing.shared_memory`.
+
+Every attribute of the container class must declare a single-character numeric
+``fmt`` option (``Attr(fmt='d')``, ``Attr(fmt='q')``, ...). Each attribute gets its own
+column in the shared memory block, so a :class:`SharedArray` can be handed to worker
+processes (it pickles to just the block name) which then attach to the same memory::
+
+    with SharedArray.from_instances(Point, points) as array:
+        pool.map(work, [array] * n)
+
+Items of the array are lightweight views exposing the attribute names of the
+container class, reading and writing shared memory directly.
+"""
+import struct
+from multiprocessing import shared_memory
+
+from .attrs3 import ATTRS_ALL_NAMES, get_class_cache
+
+SHARED_VIEW_CLS = 'shared_view_cls'
+
+NUMERIC_FORMATS = 'bBhHiIlLqQnNfd?'
+
+_ALIGNMENT = 8
+
+
+class SharedView:
+    """
+    Base class of generated per-container-class views of one item of a :class:`SharedArray`.
+    """
+    __slots__ = ('_columns', '_index')
+
+    _names_ = ()
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __repr__(self):
+        return '<{} {}>'.format(self.__class__.__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name)) for name in self._names_
+        ))
+
+
+def _column_property(i):
+    def fget(self):
+        return self._columns[i][self._index]
+
+    def fset(self, value):
+        self._columns[i][self._index] = value
+
+    return property(fget, fset)
+
+
+def get_shared_view_cls(container_cls):
+    """
+    Returns the view class for items of a :class:`SharedArray` of container_cls.
+    """
+    cache = get_class_cache(container_cls)
+    if SHARED_VIEW_CLS not in cache:
+        names = tuple(getattr(container_cls, ATTRS_ALL_NAMES))
+        dct = {'__slots__': (), '_names_': names}
+        for i, name in enumerate(names):
+            dct[name] = _column_property(i)
+        cache[SHARED_VIEW_CLS] = type('{}SharedView'.format(container_cls.__name__), (SharedView,), dct)
+    return cache[SHARED_VIEW_CLS]
+
+
+def get_shared_layout(container_cls, length):
+    """
+    Returns ``([(name, fmt, offset), ...], total_size)`` of length instances of container_cls.
+    """
+    layout = []
+    offset = 0
+    for name in getattr(container_cls, ATTRS_ALL_NAMES):
+        fmt = getattr(container_cls, name).options.get('fmt')
+        if not isinstance(fmt, str) or len(fmt) != 1 or fmt not in NUMERIC_FORMATS:
+            raise TypeError('{}.{} must declare a numeric fmt= option to be shared, not {!r}'.format(
+                container_cls.__name__, name, fmt,
+            ))
+        layout.append((name, fmt, offset))
+        size = struct.calcsize(fmt) * length
+        offset += -(-size // _ALIGNMENT) * _ALIGNMENT
+    return layout, offset
+
+
+class SharedArray:
+    """
+    A fixed-length array of instances of container_cls in a shared memory block.
+
+    Use :meth:`create` or :meth:`from_instances` in the owning process
+    and :meth:`attach` (or unpickling) in workers.
+    The block is unlinked when the owning process leaves the ``with`` block
+    or calls :meth:`unlink` explicitly.
+    """
+
+    def __init__(self, container_cls, length, shm, readonly=False, owner=False):
+        self.container_cls = container_cls
+        self.length = length
+        self.shm = shm
+        self.readonly = readonly
+        self.owner = owner
+
+        buffer = shm.buf.toreadonly() if readonly else shm.buf
+        layout, _ = get_shared_layout(container_cls, length)
+        self.columns = {
+            name: buffer[offset:offset + struct.calcsize(fmt) * length].cast(fmt)
+            for name, fmt, offset in layout
+        }
+        self._column_list = [self.columns[name] for name, _, _ in layout]
+        self._view_cls = get_shared_view_cls(container_cls)
+
+    @classmethod
+    def create(cls, container_cls, length):
+        _, size = get_shared_layout(container_cls, length)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            return cls(container_cls, length, shm, owner=True)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def from_instances(cls, container_cls, instances):
+        instances = list(instances)
+        array = cls.create(container_cls, len(instances))
+        try:
+            for i, instance in enumerate(instances):
+                array.store(i, instance)
+        except Exception:
+            array.close()
+            array.unlink()
+            raise
+        return array
+
+    @classmethod
+    def attach(cls, container_cls, name, length, readonly=True):
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 has no track= and registers attached blocks with the resource tracker.
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(container_cls, length, shm, readonly=readonly)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __repr__(self):
+        return '<{} {} x {} {!r}>'.format(self.__class__.__name__, self.container_cls.__name__, self.length, self.name)
+
+    def __reduce__(self):
+        return self.attach, (self.container_cls, self.name, self.length, self.readonly)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self._view_cls(self._column_list, index)
+
+    def __iter__(self):
+        view_cls = self._view_cls
+        columns = self._column_list
+        return (view_cls(columns, i) for i in range(self.length))
+
+    def store(self, index, instance):
+        """
+        Copies attribute values of instance into item at index.
+        Raises ValueError, leaving the item as it was, if any of the values is None.
+        """
+        view = self[index]
+        values = [getattr(instance, name) for name in self.columns]
+        if None in values:
+            missing = [name for name, value in zip(self.columns, values) if value is None]
+            raise ValueError('{!r} has no value for {} which cannot be None in shared memory'.format(
+                instance, ', '.join(missing),
+            ))
+        for name, value in zip(self.columns, values):
+            setattr(view, name, value)
+
+    def load(self, index):
+        """
+        Returns a new container instance with values copied from item at index.
+        """
+        view = self[index]
+        return self.container_cls(**{name: getattr(view, name) for name in self.columns})
+
+    def close(self):
+        for column in self._column_list:
+            column.release()
+        self.columns.clear()
+        self._column_list = []
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        if self.owner:
+            self.unlink()
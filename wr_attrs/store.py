@@ -0,0 +1,267 @@
+"""
+Append-only on-disk store of container records, read through :mod:`mmap`.
+
+The layout is derived from the ``fmt`` options of the attributes of the container class:
+
+- a :mod:`struct` format of a number (``fmt='d'``, ``fmt='q'``, ...) or of
+  fixed-length bytes (``fmt='16s'``) is stored in the fixed-width record itself,
+- ``fmt='str'`` and ``fmt='bytes'`` are variable-width values stored in a separate heap
+  file (``path + '.heap'``), with their offset and length stored in the record.
+
+Records all have the same size, so reopening a store only reads its header.
+Items of a store are lazy views which decode an attribute when it is accessed.
+None is stored as a missing value and read back as None.
+"""
+import mmap
+import os
+import struct
+import zlib
+
+from .attrs3 import ATTRS_ALL_NAMES, get_class_cache
+from .codec import VARIABLE_FORMATS, get_codec
+
+STORE_VIEW_CLS = 'store_view_cls'
+
+MAGIC = b'WRAS'
+
+_header = struct.Struct('<4sII')
+_heap_ref = struct.Struct('<QI')
+
+
+class StoreLayout:
+    """
+    Positions of attributes of container_cls within a record.
+    """
+
+    def __init__(self, container_cls):
+        self.container_cls = container_cls
+        self.names = tuple(getattr(container_cls, ATTRS_ALL_NAMES))
+        self.mask_size = (len(self.names) + 7) // 8
+
+        self.fields = []  # (name, struct, offset, is_variable, is_str)
+        fmts = []
+        offset = self.mask_size
+        for name in self.names:
+            fmt = getattr(container_cls, name).options.get('fmt')
+            fmts.append(fmt)
+            if fmt in VARIABLE_FORMATS:
+                self.fields.append((name, _heap_ref, offset, True, fmt == 'str'))
+                offset += _heap_ref.size
+                continue
+            try:
+                field_struct = struct.Struct('<' + fmt) if fmt else None
+            except struct.error:
+                field_struct = None
+            if field_struct is None or len(field_struct.unpack(bytes(field_struct.size))) != 1:
+                raise TypeError('{}.{} must declare a fmt= option of a single value to be stored, not {!r}'.format(
+                    container_cls.__name__, name, fmt,
+                ))
+            self.fields.append((name, field_struct, offset, False, False))
+            offset += field_struct.size
+        self.record_size = offset
+        # The codec fingerprint covers the class and attribute names; the formats decide how values are read back
+        self.fingerprint = zlib.crc32('{}|{}'.format(
+            get_codec(container_cls).fingerprint, ','.join(fmts),
+        ).encode('utf-8'))
+
+    def pack(self, instance):
+        """
+        Returns ``(record, heap_values)`` of instance: the record with all but the heap offsets filled in,
+        and ``[(offset, value), ...]`` of variable-width values which are to be written to the heap.
+        Raises ValueError if a value can not be stored with the format of its attribute.
+        """
+        mask = 0
+        record = bytearray(self.record_size)
+        heap_values = []
+        for i, (name, field_struct, offset, is_variable, is_str) in enumerate(self.fields):
+            value = getattr(instance, name)
+            if value is None:
+                continue
+            mask |= 1 << i
+            try:
+                if is_variable:
+                    value = value.encode('utf-8') if is_str else bytes(memoryview(value))
+                    heap_values.append((offset, value))
+                else:
+                    field_struct.pack_into(record, offset, value)
+            except (struct.error, AttributeError, TypeError, ValueError, OverflowError) as e:
+                raise ValueError('Cannot store {!r} in {}.{}: {}'.format(
+                    value, self.container_cls.__name__, name, e,
+                ))
+        record[:self.mask_size] = mask.to_bytes(self.mask_size, 'little')
+        return record, heap_values
+
+
+class StoreView:
+    """
+    Base class of generated per-container-class views of one record of a :class:`RecordStore`.
+    """
+    __slots__ = ('_store', '_offset')
+
+    _names_ = ()
+
+    def __init__(self, store, offset):
+        self._store = store
+        self._offset = offset
+
+    def __repr__(self):
+        return '<{} {}>'.format(self.__class__.__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name)) for name in self._names_
+        ))
+
+
+def _field_property(i, field_struct, field_offset, is_variable, is_str):
+    mask_byte, mask_bit = divmod(i, 8)
+
+    def fget(self):
+        data = self._store._data
+        if not data[self._offset + mask_byte] >> mask_bit & 1:
+            return None
+        if not is_variable:
+            return field_struct.unpack_from(data, self._offset + field_offset)[0]
+        heap_offset, size = field_struct.unpack_from(data, self._offset + field_offset)
+        value = self._store._heap[heap_offset:heap_offset + size]
+        return value.decode('utf-8') if is_str else value
+
+    return property(fget)
+
+
+def get_store_view_cls(container_cls):
+    """
+    Returns the view class for records of a :class:`RecordStore` of container_cls.
+    """
+    cache = get_class_cache(container_cls)
+    if STORE_VIEW_CLS not in cache:
+        layout = StoreLayout(container_cls)
+        dct = {'__slots__': (), '_names_': layout.names}
+        for i, (name, field_struct, offset, is_variable, is_str) in enumerate(layout.fields):
+            dct[name] = _field_property(i, field_struct, offset, is_variable, is_str)
+        cache[STORE_VIEW_CLS] = type('{}StoreView'.format(container_cls.__name__), (StoreView,), dct)
+    return cache[STORE_VIEW_CLS]
+
+
+class RecordStore:
+    """
+    Append-only file of records of container_cls, created if it does not exist.
+
+    Appended records are buffered and written in batches of batch_size,
+    or when :meth:`flush` is called. Only written records are counted by ``len()``.
+    """
+
+    def __init__(self, container_cls, path, batch_size=1024):
+        self.container_cls = container_cls
+        self.path = path
+        self.batch_size = batch_size
+        self.layout = StoreLayout(container_cls)
+        self._view_cls = get_store_view_cls(container_cls)
+
+        self._file = open(path, 'a+b')
+        self._heap_file = open(path + '.heap', 'a+b')
+        self._pending = []
+        self._data = b''
+        self._heap = b''
+
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.write(_header.pack(MAGIC, self.layout.fingerprint, self.layout.record_size))
+            self._file.flush()
+        self._map()
+
+        magic, fingerprint, record_size = _header.unpack_from(self._data)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError('{} is not a record store'.format(path))
+        if (fingerprint, record_size) != (self.layout.fingerprint, self.layout.record_size):
+            self.close()
+            raise ValueError('{} was not written with the schema of {}'.format(path, container_cls.__name__))
+
+    def __repr__(self):
+        return '<{} {} {!r}>'.format(self.__class__.__name__, self.container_cls.__name__, self.path)
+
+    def _map(self):
+        for data in (self._data, self._heap):
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        heap_size = os.fstat(self._heap_file.fileno()).st_size
+        self._heap = mmap.mmap(self._heap_file.fileno(), 0, access=mmap.ACCESS_READ) if heap_size else b''
+        self._length = (len(self._data) - _header.size) // self.layout.record_size
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return self._view_cls(self, _header.size + index * self.layout.record_size)
+
+    def __iter__(self):
+        view_cls = self._view_cls
+        record_size = self.layout.record_size
+        return (view_cls(self, _header.size + i * record_size) for i in range(self._length))
+
+    def load(self, index):
+        """
+        Returns a new container instance with the values of the record at index.
+        """
+        view = self[index]
+        values = {name: getattr(view, name) for name in self.layout.names}
+        return self.container_cls(**{k: v for k, v in values.items() if v is not None})
+
+    def append(self, instance):
+        """
+        Buffers a record of instance. Values are encoded right away, so an instance
+        that can not be stored raises ValueError here and is not buffered.
+        """
+        self._pending.append(self.layout.pack(instance))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def extend(self, instances):
+        for instance in instances:
+            self.append(instance)
+
+    def flush(self):
+        """
+        Writes buffered records and makes them available for reading.
+        """
+        if not self._pending:
+            return
+
+        heap_offset = self._heap_file.seek(0, os.SEEK_END)
+        records = []
+        heap = []
+        for record, heap_values in self._pending:
+            for offset, value in heap_values:
+                _heap_ref.pack_into(record, offset, heap_offset, len(value))
+                heap.append(value)
+                heap_offset += len(value)
+            records.append(record)
+
+        # Heap first, so that a record is never written before the values it points to
+        self._heap_file.write(b''.join(heap))
+        self._heap_file.flush()
+        self._file.write(b''.join(records))
+        self._file.flush()
+        self._pending = []
+        self._map()
+
+    def close(self):
+        try:
+            if self._pending and not self._file.closed:
+                self.flush()
+        finally:
+            self._pending = []
+            for data in (self._data, self._heap):
+                if isinstance(data, mmap.mmap):
+                    data.close()
+            self._data = self._heap = b''
+            self._file.close()
+            self._heap_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()